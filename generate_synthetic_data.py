@@ -30,6 +30,9 @@ from docx.shared import Pt, RGBColor, Inches
 SYNTHETIC_DIR = Path("data/synthetic")
 SYNTHETIC_DIR.mkdir(parents=True, exist_ok=True)
 
+# Banner rule for console output
+SEP70 = "=" * 70
+
 # Sample data
 APPLICANTS = [
     {
@@ -606,18 +609,18 @@ def generate_applicant_profile(applicant):
 
 def main():
     """Generate synthetic data for all applicants."""
-    print("=" * 70)
+    print(SEP70)
     print("GENERATING SYNTHETIC APPLICANT DATA")
-    print("=" * 70)
+    print(SEP70)
     print(f"Output directory: {SYNTHETIC_DIR.absolute()}")
     print(f"Number of applicants: {len(APPLICANTS)}")
     
     for applicant in APPLICANTS:
         generate_applicant_profile(applicant)
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP70)
     print("[OK] All synthetic data generated successfully!")
-    print("=" * 70)
+    print(SEP70)
     print(f"\nDirectory structure:")
     print(f"  data/synthetic/")
     for applicant in APPLICANTS:
@@ -14,6 +14,7 @@ The ReAct pattern enables agents to:
 from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 from datetime import datetime
+import asyncio
 import json
 
 
@@ -185,6 +186,47 @@ class BaseAgent(ABC):
             "state_summary": self.state.get_summary()
         }
     
+    async def act_async(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Async action step.
+        
+        Defaults to running act() in a worker thread; agents with native
+        async I/O (e.g. LLM calls) override this.
+        """
+        return await asyncio.to_thread(self.act, state)
+    
+    async def aexecute(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async version of execute() that awaits act_async().
+        
+        Args:
+            context: Input context for the agent
+            
+        Returns:
+            Execution result
+        """
+        state = AgentState(initial_context=context)
+        self.state = state
+        
+        # Reason
+        reasoning = self.reason(state)
+        state.add_reasoning(reasoning)
+        
+        # Act
+        action_result = await self.act_async(state)
+        state.add_action(f"{self.name} action", action_result)
+        
+        # Observe
+        observation = self.observe(state, action_result)
+        
+        return {
+            "agent": self.name,
+            "result": action_result,
+            "observation": observation,
+            "reasoning": reasoning,
+            "state_summary": state.get_summary()
+        }
+    
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}')"
 
@@ -11,9 +11,15 @@ This agent is responsible for extracting information from various document types
 Uses ReAct pattern for intelligent document processing.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+import functools
+import mmap
+import os
+import zipfile
+import xml.etree.ElementTree as ElementTree
 import PyPDF2
 import pdfplumber
+import pypdfium2 as pdfium
 from docx import Document
 import pandas as pd
 from pathlib import Path
@@ -23,6 +29,121 @@ from .base_agent import BaseAgent, AgentState, AgentResponse
 from ..database import db_manager
 from ..config import settings, ollama_cloud_run
 
+# Translation table that deletes signs and thousands separators from amounts
+_AMOUNT_STRIP = str.maketrans('', '', '+,')
+
+# Bank statement transaction line: Date Description +/-Amount [Balance]
+# Matches: 05-Jan-2026 Salary Deposit +11,000.00 56,000.00
+# A line without a running balance must end at the amount
+_TRANSACTION_RE = re.compile(
+    r'(?P<date>\d{2}-\w+-\d{4})\s+(?P<desc>.+?)\s+(?P<amt>[+-][\d,]+\.?\d*)'
+    r'(?:\s+(?P<bal>[\d,]+\.?\d*)|\s*$)'
+)
+
+# Income category of a transaction description, read from match.lastgroup.
+# Lookaheads keep salary keywords winning wherever they appear in the line.
+_CATEGORY_RE = re.compile(
+    r'(?=.*(?:salary|payroll))(?P<salary>)|(?=.*(?:freelance|contract|project))(?P<freelance>)',
+    re.IGNORECASE
+)
+
+# Transactions kept in a bank statement result (the first ones on the statement)
+MAX_RETURNED_TRANSACTIONS = 15
+
+# DOCX fast path: WordprocessingML element names in word/document.xml
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY, _W_P, _W_R, _W_HYPERLINK = _W + 'body', _W + 'p', _W + 'r', _W + 'hyperlink'
+_W_T, _W_BR, _W_TYPE = _W + 't', _W + 'br', _W + 'type'
+# Run children rendered as fixed text, as python-docx's Run.text does
+_DOCX_RUN_CHARS = {
+    _W + 'tab': '\t',
+    _W + 'ptab': '\t',
+    _W + 'cr': '\n',
+    _W + 'noBreakHyphen': '-',
+}
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """
+    Text of a w:p element, matching python-docx's Paragraph.text: runs
+    (including those inside hyperlinks) contribute their w:t text, tabs
+    and carriage returns; line breaks become newlines while page and
+    column breaks are dropped.
+    """
+    parts = []
+    for child in paragraph:
+        if child.tag == _W_R:
+            runs = (child,)
+        elif child.tag == _W_HYPERLINK:
+            runs = child.iterfind(_W_R)
+        else:
+            continue
+        for run in runs:
+            for item in run:
+                tag = item.tag
+                if tag == _W_T:
+                    parts.append(item.text or '')
+                elif tag == _W_BR:
+                    if item.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                        parts.append('\n')
+                else:
+                    char = _DOCX_RUN_CHARS.get(tag)
+                    if char is not None:
+                        parts.append(char)
+    return ''.join(parts)
+
+
+def _pdfium_pages(file_path: str) -> Tuple[str, ...]:
+    """
+    Extract page texts with PDFium.
+    
+    PDFium interprets content streams in C, where pdfplumber runs pdfminer's
+    pure-Python interpreter per operator; text-only extraction doesn't need
+    pdfplumber's layout objects.
+    """
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        texts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range().replace('\r\n', '\n'))
+            textpage.close()
+            page.close()
+        return tuple(texts)
+    finally:
+        pdf.close()
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_pdf_pages(file_path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    Extract page texts from a PDF.
+    
+    mtime_ns and size are only part of the cache key: a modified file gets
+    a new key and is parsed again.
+    """
+    try:
+        return _pdfium_pages(file_path)
+    except Exception:
+        pass
+    
+    # Fallback to pdfplumber for files PDFium can't open; extract_text_simple
+    # only clusters characters into lines, skipping word and layout analysis
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            return tuple(page.extract_text_simple() or "" for page in pdf.pages)
+    except Exception:
+        # Fallback to PyPDF2, reading through a memory map so the OS pages
+        # the file in on demand instead of copying it through Python buffers
+        try:
+            with open(file_path, 'rb') as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    reader = PyPDF2.PdfReader(mapped)
+                    return tuple(page.extract_text() or "" for page in reader.pages)
+        except Exception:
+            return ()
+
+
 class DataExtractionAgent(BaseAgent):
     """
     Agent specialized in extracting structured data from multimodal documents.
@@ -120,18 +241,8 @@ class DataExtractionAgent(BaseAgent):
         
         try:
             # Route to appropriate extraction method
-            if doc_type == 'bank_statement':
-                extracted_data = self._extract_bank_statement(file_path)
-            elif doc_type == 'emirates_id':
-                extracted_data = self._extract_emirates_id(file_path)
-            elif doc_type == 'resume':
-                extracted_data = self._extract_resume(file_path)
-            elif doc_type == 'assets_liabilities':
-                extracted_data = self._extract_assets_liabilities(file_path)
-            elif doc_type == 'credit_report':
-                extracted_data = self._extract_credit_report(file_path)
-            else:
-                extracted_data = self._extract_generic(file_path)
+            extractor = self._EXTRACTORS.get(doc_type, DataExtractionAgent._extract_generic)
+            extracted_data = extractor(self, file_path)
             
             # Store document in database
             doc_id = db_manager.save_document({
@@ -140,7 +251,7 @@ class DataExtractionAgent(BaseAgent):
                 'file_path': file_path,
                 'extracted_data': extracted_data,
                 'validation_status': 'pending'
-            })
+            }, defer=state.context.get('defer_write', False))
             
             
             result = {
@@ -170,76 +281,80 @@ class DataExtractionAgent(BaseAgent):
         - Monthly income calculation
         - Transaction details with dates and balances
         
-        Pattern: Date Description +/-Amount Balance
+        Pattern: Date Description +/-Amount [Balance]
         Example: 05-Jan-2026 Salary Deposit +11,000.00 56,000.00
         """
-        text = self._extract_pdf_text(file_path)
+        pages = self._extract_pdf_pages(file_path)
         
         # Initialize tracking
         salary_deposits = []
         freelance_income = []
-        all_transactions = []
-        
-        # Split text into lines for better pattern matching
-        lines = text.split('\n')
+        transactions = []
+        transaction_count = 0
         
-        # Primary pattern: Date Description +/-Amount Balance
-        # Matches: 05-Jan-2026 Salary Deposit +11,000.00 56,000.00
-        transaction_pattern = r'(\d{2}-\w+-\d{4})\s+(.+?)\s+([+-][\d,]+\.?\d*)\s+([\d,]+\.?\d*)'
+        # Scan page by page so the whole document is never re-split into lines
+        lines = (line for page_text in pages for line in page_text.splitlines())
         
+        search = _TRANSACTION_RE.search
+        categorize = _CATEGORY_RE.match
+        # _CATEGORY_RE group name -> list the amount is added to
+        record_income = {
+            'salary': salary_deposits.append,
+            'freelance': freelance_income.append,
+        }
         for line in lines:
-            # Try to match transaction line with primary pattern
-            match = re.search(transaction_pattern, line)
+            # Every transaction line has a dd-Mon-yyyy date; skip headers and
+            # addresses without a hyphen before running the regex
+            if '-' not in line:
+                continue
+            # Try to match transaction line
+            match = search(line)
             if match:
-                date = match.group(1)
-                description = match.group(2).strip()
-                amount_str = match.group(3)
-                balance_str = match.group(4)
+                date, description, amount_str, balance_str = match.group('date', 'desc', 'amt', 'bal')
+                description = description.strip()
                 
                 try:
-                    # Extract amount (remove +/- prefix and commas)
-                    amount = float(amount_str.replace('+', '').replace(',', ''))
-                    balance = float(balance_str.replace(',', ''))
+                    # Extract amount (remove + prefix and commas in one pass)
+                    amount = float(amount_str.translate(_AMOUNT_STRIP))
+                    balance = float(balance_str.translate(_AMOUNT_STRIP)) if balance_str else None
                     
                     # Only track positive amounts (income)
                     if amount > 0:
-                        transaction = {
-                            'date': date,
-                            'description': description,
-                            'amount': amount,
-                            'balance': balance
-                        }
-                        all_transactions.append(transaction)
+                        # Only the first few are returned, so stop storing once full
+                        transaction_count += 1
+                        if transaction_count <= MAX_RETURNED_TRANSACTIONS:
+                            transactions.append({
+                                'date': date,
+                                'description': description,
+                                'amount': amount,
+                                'balance': balance
+                            })
                         
-                        # Check if it's salary deposit
-                        desc_lower = description.lower()
-                        if any(kw in desc_lower for kw in ['salary', 'salary deposit', 'payroll', 'monthly salary', 'salary payment']):
-                            salary_deposits.append(amount)
-                        
-                        # Check if it's freelance income
-                        elif any(kw in desc_lower for kw in ['freelance', 'freelance income', 'contract', 'freelance payment', 'project']):
-                            freelance_income.append(amount)
+                        # Salary deposit or freelance income
+                        category = categorize(description)
+                        if category is not None:
+                            record_income[category.lastgroup](amount)
                 
                 except ValueError:
                     # Skip lines that can't be parsed as numbers
                     continue
         
-        # Calculate totals
-        total_salary = sum(salary_deposits) if salary_deposits else 0.0
-        total_freelance = sum(freelance_income) if freelance_income else 0.0
+        # Calculate totals (float start value, so empty lists give 0.0)
+        total_salary = sum(salary_deposits, 0.0)
+        total_freelance = sum(freelance_income, 0.0)
         total_income = total_salary + total_freelance
         
         return {
-            'raw_text': text,
-            'monthly_income': float(total_income),
-            'salary_deposits': float(total_salary),
+            'raw_text': "".join(pages),
+            'monthly_income': total_income,
+            'salary_deposits': total_salary,
             'salary_deposit_count': len(salary_deposits),
             'salary_deposit_list': salary_deposits,
-            'freelance_income': float(total_freelance),
+            'freelance_income': total_freelance,
             'freelance_income_count': len(freelance_income),
             'freelance_income_list': freelance_income,
-            'total_transactions': len(all_transactions),
-            'transactions': all_transactions[:15],  # Return first 15 transactions
+            'total_transactions': transaction_count,
+            'transactions': transactions,
             'summary': f'Salary: AED {total_salary:,.2f} ({len(salary_deposits)} deposits), '
                       f'Freelance: AED {total_freelance:,.2f} ({len(freelance_income)} income), '
                       f'Total Monthly Income: AED {total_income:,.2f}'
@@ -259,12 +374,7 @@ class DataExtractionAgent(BaseAgent):
     
     def _extract_resume(self, file_path: str) -> Dict[str, Any]:
         """Extract data from resume PDF/DOCX using LLM for employment status and job details."""
-        if file_path.endswith('.pdf'):
-            text = self._extract_pdf_text(file_path)
-        elif file_path.endswith('.docx'):
-            text = self._extract_docx_text(file_path)
-        else:
-            text = ""
+        text = self._extract_text_by_suffix(file_path)
 
         llm_result = self._llm_validate(text)
         employment_status = llm_result.get('employment_status', 'unknown')
@@ -457,26 +567,38 @@ Respond ONLY with a JSON object.
     
     def _extract_pdf_text(self, file_path: str) -> str:
         """Extract text from PDF file."""
+        return "".join(self._extract_pdf_pages(file_path))
+    
+    def _extract_pdf_pages(self, file_path: str) -> Tuple[str, ...]:
+        """Extract text from PDF file, one string per page.
+        
+        Results are cached by (path, mtime, size), so retries within a
+        workflow don't re-parse an unchanged file.
+        """
         try:
-            with pdfplumber.open(file_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-                return text
-        except Exception:
-            # Fallback to PyPDF2
-            try:
-                with open(file_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text() or ""
-                    return text
-            except Exception:
-                return ""
+            stat = os.stat(file_path)
+        except OSError:
+            return ()
+        return _cached_pdf_pages(file_path, stat.st_mtime_ns, stat.st_size)
     
     def _extract_docx_text(self, file_path: str) -> str:
-        """Extract text from DOCX file."""
+        """Extract text from DOCX file.
+        
+        Parses word/document.xml with ElementTree instead of building the
+        full python-docx object model. Like doc.paragraphs, it reads the
+        body-level paragraphs only, empty ones included; python-docx is
+        only used as a fallback for files the fast path can't read.
+        """
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                root = ElementTree.fromstring(archive.read('word/document.xml'))
+            return "\n".join(
+                _docx_paragraph_text(paragraph)
+                for paragraph in root.find(_W_BODY).iterfind(_W_P)
+            )
+        except Exception:
+            pass
+        
         try:
             doc = Document(file_path)
             text = "\n".join([para.text for para in doc.paragraphs])
@@ -486,17 +608,31 @@ Respond ONLY with a JSON object.
     
     def _extract_generic(self, file_path: str) -> Dict[str, Any]:
         """Generic text extraction for unknown file types."""
-        if file_path.endswith('.pdf'):
-            text = self._extract_pdf_text(file_path)
-        elif file_path.endswith('.docx'):
-            text = self._extract_docx_text(file_path)
-        else:
-            text = ""
+        text = self._extract_text_by_suffix(file_path)
         
         return {
             'raw_text': text,
             'summary': 'Generic text extraction completed'
         }
+    
+    def _extract_text_by_suffix(self, file_path: str) -> str:
+        """Extract plain text using the reader registered for the file extension."""
+        reader = self._TEXT_READERS.get(os.path.splitext(file_path)[1])
+        return reader(self, file_path) if reader else ""
+    
+    # Dispatch tables: document type -> extractor, file extension -> text reader
+    _EXTRACTORS = {
+        'bank_statement': _extract_bank_statement,
+        'emirates_id': _extract_emirates_id,
+        'resume': _extract_resume,
+        'assets_liabilities': _extract_assets_liabilities,
+        'credit_report': _extract_credit_report,
+    }
+    
+    _TEXT_READERS = {
+        '.pdf': _extract_pdf_text,
+        '.docx': _extract_docx_text,
+    }
 
 
 # Global instance
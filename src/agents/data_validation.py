@@ -10,12 +10,13 @@ This agent validates extracted data for:
 Uses ReAct pattern for intelligent validation with LLM reasoning.
 """
 
-from typing import Dict, Any, List, Optional
-import ollama
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 from .base_agent import BaseAgent, AgentState, AgentResponse
 from ..database import db_manager
-from ..config import ollama_cloud_run, settings, ELIGIBILITY_CRITERIA
+from ..config import ollama_cloud_run, get_ollama_client, settings, ELIGIBILITY_CRITERIA
 
 class DataValidationAgent(BaseAgent):
     """
@@ -37,6 +38,9 @@ class DataValidationAgent(BaseAgent):
             name="DataValidationAgent",
             description="Validates data consistency and completeness across documents"
         )
+        # Circuit breaker: number of upcoming LLM calls to skip after a failure
+        self._llm_skip_remaining = 0
+        self._llm_skip_lock = threading.Lock()
     
     def reason(self, state: AgentState) -> str:
         """
@@ -84,9 +88,66 @@ class DataValidationAgent(BaseAgent):
         - Use LLM for semantic validation
         - Flag inconsistencies
         """
-        applicant_id = state.context.get('applicant_id')
         extracted_data = state.context.get('extracted_data', {})
         
+        validation_results, missing_fields = self._rule_validate(extracted_data)
+        
+        # Use LLM for semantic validation, only when there is something to reason about
+        if self._needs_llm_validation(validation_results, missing_fields):
+            validation_results['llm_insights'] = self._llm_validate(extracted_data)
+        
+        return {
+            'action': 'validate_data',
+            'success': True,
+            'validation_results': validation_results
+        }
+    
+    def validate_batch(self, contexts: List[Dict[str, Any]], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Validate several applicants' data, overlapping the LLM round-trips.
+        
+        Rule checks are cheap and run in the calling thread; only the
+        semantic LLM validations are dispatched to a thread pool, since
+        they spend their time waiting on Ollama rather than on Python.
+        
+        Args:
+            contexts: Agent contexts, each with an 'extracted_data' dict
+            max_workers: Maximum number of concurrent LLM calls
+            
+        Returns:
+            One action result per context, in the same order
+        """
+        checked = []
+        for context in contexts:
+            extracted_data = context.get('extracted_data', {})
+            validation_results, missing_fields = self._rule_validate(extracted_data)
+            checked.append((extracted_data, validation_results, missing_fields))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                index: executor.submit(self._llm_validate, extracted_data)
+                for index, (extracted_data, validation_results, missing_fields) in enumerate(checked)
+                if self._needs_llm_validation(validation_results, missing_fields)
+            }
+            for index, future in futures.items():
+                checked[index][1]['llm_insights'] = future.result()
+        
+        return [
+            {
+                'action': 'validate_data',
+                'success': True,
+                'validation_results': validation_results
+            }
+            for _, validation_results, _ in checked
+        ]
+    
+    def _rule_validate(self, extracted_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run the rule-based completeness, range and consistency checks.
+        
+        Returns:
+            Validation results and the list of missing required fields
+        """
         validation_results = {
             'is_valid': True,
             'completeness_score': 0.0,
@@ -153,11 +214,6 @@ class DataValidationAgent(BaseAgent):
             validation_results['is_valid'] = False
             validation_results['requires_user_action'] = True
         
-        # Use LLM for semantic validation
-        if validation_results['completeness_score'] > 0.5:
-            llm_validation = self._llm_validate(extracted_data)
-            validation_results['llm_insights'] = llm_validation
-        
         # Mark as critical if completeness is too low
         if validation_results['completeness_score'] < 0.5:
             validation_results['is_valid'] = False
@@ -168,18 +224,30 @@ class DataValidationAgent(BaseAgent):
         #     # Allow processing with warnings if at least 50% of data is present
         #     validation_results['is_valid'] = True
         
-        return {
-            'action': 'validate_data',
-            'success': True,
-            'validation_results': validation_results
-        }
+        return validation_results, missing_fields
+    
+    def _needs_llm_validation(self, validation_results: Dict[str, Any], missing_fields: List[str]) -> bool:
+        """Only ask the LLM when the data is mostly complete and the rules found something."""
+        has_findings = (
+            validation_results['issues']
+            or validation_results['warnings']
+            or len(missing_fields) > 0
+        )
+        return validation_results['completeness_score'] > 0.5 and bool(has_findings)
     
     def _llm_validate(self, extracted_data: Dict[str, Any]) -> str:
         """
         Use local LLM to perform semantic validation.
         
         This demonstrates LLM integration for intelligent data validation.
+        After a failed call the next `settings.llm_circuit_breaker_skip` calls
+        are skipped so a slow or unavailable LLM doesn't stall the pipeline.
         """
+        with self._llm_skip_lock:
+            if self._llm_skip_remaining > 0:
+                self._llm_skip_remaining -= 1
+                return "LLM validation skipped: LLM recently unavailable"
+        
         try:
             # Prepare prompt for LLM
             prompt = f"""
@@ -205,7 +273,7 @@ class DataValidationAgent(BaseAgent):
                 return response
             else:
                 # Call local Ollama LLM
-                response = ollama.generate(
+                response = get_ollama_client().generate(
                     model=settings.ollama_model,
                     prompt=prompt
                 )
@@ -213,6 +281,8 @@ class DataValidationAgent(BaseAgent):
                 return response['response']
             
         except Exception as e:
+            with self._llm_skip_lock:
+                self._llm_skip_remaining = settings.llm_circuit_breaker_skip
             return f"LLM validation unavailable: {str(e)}"
     
     def _format_data_for_llm(self, data: Dict[str, Any]) -> str:
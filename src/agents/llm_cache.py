@@ -0,0 +1,171 @@
+"""
+LLM Response Caching
+
+Agents call the LLM with prompts that are often identical or nearly
+identical across applicants (same decision band, similar income, same
+employment status). This module lets them reuse earlier responses:
+
+- Exact hits: the canonical prompt text is already cached
+- Semantic hits: a cached prompt embedding is within a cosine-similarity
+  threshold of the new prompt's embedding
+
+Embeddings come from the local Ollama server. Caches created with a
+namespace are also written through to the SQLite llm_cache table, so they
+survive restarts and are shared between worker processes. A TTL bounds how
+long a cached response may be served.
+"""
+
+from typing import Optional, List
+from collections import OrderedDict
+import hashlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from ..config import settings, get_ollama_client
+from ..database import db_manager
+
+
+class SemanticCache:
+    """
+    Bounded LRU cache of LLM responses with a cosine-similarity index.
+
+    Entries are keyed by prompt text. Each entry can optionally carry the
+    prompt's embedding, which makes it a candidate for similarity lookups.
+    The embedding matrix is rebuilt lazily after the entry set changes.
+
+    With a namespace, entries are persisted to SQLite keyed by the SHA-256 of
+    namespace and prompt; the most recent ones are loaded on construction
+    and exact misses fall back to the table.
+
+    With a TTL, entries older than ttl seconds are treated as misses and
+    dropped.
+    """
+
+    def __init__(self, max_entries: int = 1000, threshold: float = 0.95, namespace: Optional[str] = None,
+                 ttl: Optional[float] = None):
+        """
+        Initialize semantic cache.
+
+        Args:
+            max_entries: Maximum number of cached responses (least recently used are evicted)
+            threshold: Minimum cosine similarity for a semantic hit
+            namespace: Persist entries to SQLite under this namespace (memory only if None)
+            ttl: Maximum age of a served entry in seconds (no expiry if None)
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.namespace = namespace
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (normalized embedding or None, response, created timestamp)
+        self._keys: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        if namespace is not None:
+            self._load_persisted()
+
+    def get_exact(self, key: str) -> Optional[str]:
+        """Return the response cached for this exact prompt, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry):
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+                self._dirty = True
+        if self.namespace is None:
+            return None
+        try:
+            return db_manager.get_cached_llm_response(self._hash(key), max_age=self.ttl)
+        except sqlite3.Error:
+            return None
+
+    def get_similar(self, embedding: np.ndarray) -> Optional[str]:
+        """Return the response of the most similar cached prompt above the threshold."""
+        query = _normalize(embedding)
+        with self._lock:
+            if self._dirty:
+                self._rebuild_index()
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                return None
+            similarities = self._matrix @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            key = self._keys[best]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry):
+                del self._entries[key]
+                self._dirty = True
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, embedding: Optional[np.ndarray], response: str):
+        """Cache a response, evicting the least recently used entry when full."""
+        normalized = _normalize(embedding) if embedding is not None else None
+        with self._lock:
+            self._entries[key] = (normalized, response, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+        if self.namespace is not None:
+            try:
+                db_manager.save_cached_llm_response(
+                    self._hash(key),
+                    self.namespace,
+                    key,
+                    response,
+                    normalized.tobytes() if normalized is not None else None
+                )
+            except sqlite3.Error:
+                pass  # Persistence is best-effort; the in-memory entry still serves
+
+    def _hash(self, key: str) -> str:
+        """Persistent key for a prompt: SHA-256 of namespace and prompt text."""
+        return hashlib.sha256(f"{self.namespace}\0{key}".encode('utf-8')).hexdigest()
+
+    def _expired(self, entry) -> bool:
+        """Whether a cached entry is older than the TTL."""
+        return self.ttl is not None and time.time() - entry[2] > self.ttl
+
+    def _load_persisted(self):
+        """Warm the in-memory entries from the namespace's most recent persisted rows."""
+        try:
+            rows = db_manager.get_cached_llm_entries(self.namespace, self.max_entries, max_age=self.ttl)
+        except sqlite3.Error:
+            return
+        for row in rows:
+            embedding = np.frombuffer(row['embedding'], dtype=np.float32) if row['embedding'] else None
+            self._entries[row['prompt']] = (embedding, row['response'], row['created_epoch'])
+        self._dirty = bool(rows)
+
+    def _rebuild_index(self):
+        """Stack the cached embeddings into one matrix for vectorized lookups."""
+        keys = [key for key, (embedding, _, _) in self._entries.items() if embedding is not None]
+        self._keys = keys
+        self._matrix = np.vstack([self._entries[key][0] for key in keys]) if keys else None
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def embed_text(text: str) -> np.ndarray:
+    """Embed text with the configured Ollama embedding model."""
+    response = get_ollama_client().embeddings(model=settings.ollama_embed_model, prompt=text)
+    return np.asarray(response['embedding'], dtype=np.float32)
+
+
+def _normalize(embedding: np.ndarray) -> np.ndarray:
+    """Scale an embedding to unit length so dot products are cosine similarities."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
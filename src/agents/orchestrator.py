@@ -5,15 +5,26 @@ This is the CORE of the agentic AI system. It coordinates all specialized agents
 in a stateful workflow graph using LangGraph.
 
 LangGraph Workflow:
-1. Data Extraction → 2. Data Validation → 3. Eligibility Check → 4. Recommendation → 5. Final Decision
+1. Data Extraction → 2. Data Validation ∥ Eligibility Check ∥ Program Matching → 3. Recommendation → 4. Final Decision
 
 Each node in the graph represents an agent, and edges define the flow.
 The orchestrator maintains state across the entire workflow.
 """
 
-from typing import Dict, Any, List, TypedDict, Annotated
-from langgraph.graph import StateGraph, END
+from typing import Dict, Any, List, Tuple, TypedDict, Annotated, AsyncIterator, Callable
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+from langgraph.checkpoint.memory import MemorySaver
+from cachetools import LRUCache
+import asyncio
+import functools
+import hashlib
+import itertools
+import logging
+import os
 import operator
+import threading
+import uuid
 from datetime import datetime
 
 from .base_agent import BaseAgent, AgentState, AgentResponse
@@ -22,6 +33,96 @@ from .data_validation import data_validation_agent
 from .eligibility_check import eligibility_check_agent
 from .recommendation import recommendation_agent
 from ..database import db_manager
+from ..config import settings, run_coroutine
+
+logger = logging.getLogger(__name__)
+
+# Maximum documents extracted at the same time per application
+EXTRACTION_CONCURRENCY = 8
+
+# Most priority programs carried into the final decision
+MAX_PRIORITY_PROGRAMS = 5
+
+# Extracted fields that fall back to the submitted applicant data when missing
+FALLBACK_FIELDS = (
+    'monthly_income',
+    'employment_status',
+    'total_assets',
+    'total_liabilities',
+    'credit_score'
+)
+
+# Inputs the eligibility score depends on, and a cache of scores keyed by them.
+# Only the deterministic part (score, decision, confidence, factors) is kept;
+# explanations go through the agent's TTL-aware explanation cache every time,
+# so an LLM failure's templated fallback is never pinned here.
+ELIGIBILITY_FEATURES = (
+    'monthly_income',
+    'employment_status',
+    'family_size',
+    'total_assets',
+    'total_liabilities',
+    'asset_liability_ratio',
+    'credit_score'
+)
+_eligibility_cache = LRUCache(maxsize=4096)
+_eligibility_cache_lock = threading.Lock()
+
+# Stages written by branches that run alongside validation; they only count
+# once the validation gate lets the workflow through to finalize
+SPECULATIVE_STAGES = frozenset({'eligibility_complete', 'recommendations_complete'})
+
+
+def _copy_scored(eligibility_results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of an eligibility result without its explanation; factor dicts are copied too, so callers never share them."""
+    scored = {key: value for key, value in eligibility_results.items() if key != 'explanation'}
+    scored['factors'] = tuple(dict(factor) for factor in eligibility_results.get('factors', ()))
+    return scored
+
+
+# Langfuse tracing handler, shared by all workflow runs. Without credentials
+# (the usual local setup) no handler is created at all, so graph runs carry
+# no callbacks instead of dispatching every node event to a disabled client.
+_LANGFUSE_HANDLER = None
+if settings.langfuse_public_key and settings.langfuse_secret_key:
+    try:
+        from langfuse.langchain import CallbackHandler
+        _LANGFUSE_HANDLER = CallbackHandler()
+    except Exception:
+        _LANGFUSE_HANDLER = None  # Tracing unavailable; workflows run untraced
+_CALLBACKS = (_LANGFUSE_HANDLER,) if _LANGFUSE_HANDLER else ()
+
+def node_handler(error_label: str, fallback: Callable[[str], Dict[str, Any]]):
+    """
+    Shared error handling for async workflow nodes.
+    
+    If the node raises, its update becomes fallback(error_msg) with the
+    error appended to the workflow errors, so the graph keeps going.
+    
+    Args:
+        error_label: Prefix for the error message
+        fallback: Builds the node's substitute update from the error message
+    """
+    def decorator(node):
+        @functools.wraps(node)
+        async def wrapper(self, state):
+            try:
+                return await node(self, state)
+            except Exception as e:
+                error_msg = f"{error_label}: {str(e)}"
+                logger.warning(error_msg)
+                update = fallback(error_msg)
+                update['errors'] = [error_msg]
+                return update
+        return wrapper
+    return decorator
+
+
+def _extend(current: list, new: list) -> list:
+    """State reducer that appends a node's new entries in place (O(new), not O(total))."""
+    current.extend(new)
+    return current
+
 
 # Define the state structure for the workflow
 class WorkflowState(TypedDict):
@@ -30,17 +131,22 @@ class WorkflowState(TypedDict):
     
     This state is passed between agents and updated at each step.
     LangGraph manages the state transitions automatically.
+    
+    Nodes return only the keys they change; list-valued keys with a
+    reducer receive just the node's new entries.
     """
     applicant_id: str
     applicant_name: str
     applicant_data: Dict[str, Any]
     documents: List[Dict[str, Any]]
     extracted_data: Dict[str, Any]
-    validation_results: Dict[str, Any]
-    eligibility_results: Dict[str, Any]
+    validation_results: Annotated[Dict[str, Any], operator.or_]  # Written by a parallel branch
+    eligibility_results: Annotated[Dict[str, Any], operator.or_]  # Written by a parallel branch
+    matched_programs: Annotated[Dict[str, Any], operator.or_]  # Written by a parallel branch
     recommendations: Dict[str, Any]
     final_decision: Dict[str, Any]
-    errors: Annotated[List[str], operator.add]  # Accumulate errors
+    errors: Annotated[List[str], _extend]  # Accumulate errors
+    pending_writes: Annotated[List[Tuple[str, Dict[str, Any]]], _extend]  # Stage updates flushed at the end
     stage: str
     metadata: Dict[str, Any]
 
@@ -63,12 +169,19 @@ class OrchestratorAgent(BaseAgent):
     - State is maintained and passed between nodes
     """
     
+    # Compiled LangGraph workflow shared by all instances
+    _COMPILED_GRAPH = None
+    
     def __init__(self):
         super().__init__(
             name="OrchestratorAgent",
             description="Master orchestrator coordinating all agents using LangGraph"
         )
-        self.workflow = self._build_workflow()
+        # Compile once and share across instances; the nodes only use
+        # module-level agents, so binding them to the first instance is safe
+        if type(self)._COMPILED_GRAPH is None:
+            type(self)._COMPILED_GRAPH = self._build_workflow()
+        self.workflow = type(self)._COMPILED_GRAPH
     
     def reason(self, state: AgentState) -> str:
         """
@@ -106,7 +219,13 @@ class OrchestratorAgent(BaseAgent):
         
         This defines the complete agent workflow as a directed graph:
         
-        START → extract_documents → validate_data → check_eligibility → generate_recommendations → finalize → END
+        START → extract_documents ─┬→ validate_data ─────┬→ join_assessment → generate_recommendations → finalize → END
+                                   ├→ check_eligibility ─┤
+                                   └→ prefetch_programs ─┘
+        
+        Validation, eligibility scoring and program matching only depend on
+        the extracted data, so they run as parallel branches (Send fan-out);
+        the validation gate is applied after they join.
         
         Each node is an agent function that processes the state.
         """
@@ -117,147 +236,182 @@ class OrchestratorAgent(BaseAgent):
         workflow.add_node("extract_documents", self._extract_documents_node)
         workflow.add_node("validate_data", self._validate_data_node)
         workflow.add_node("check_eligibility", self._check_eligibility_node)
+        workflow.add_node("prefetch_programs", self._prefetch_programs_node)
+        workflow.add_node("join_assessment", self._join_assessment_node)
         workflow.add_node("generate_recommendations", self._generate_recommendations_node)
         workflow.add_node("finalize", self._finalize_node)
         
-        # Define the edges (workflow flow)
-        workflow.set_entry_point("extract_documents")
+        # Define the edges (workflow flow); applications without documents
+        # skip extraction and go straight to the assessment fan-out
+        workflow.add_conditional_edges(
+            START,
+            self._route_entry,
+            ["extract_documents", "validate_data", "check_eligibility", "prefetch_programs"]
+        )
         
-        # Linear flow with conditional branching
-        workflow.add_edge("extract_documents", "validate_data")
+        # Fan out the independent assessments, then join
+        workflow.add_conditional_edges(
+            "extract_documents",
+            self._dispatch_assessment,
+            ["validate_data", "check_eligibility", "prefetch_programs"]
+        )
+        workflow.add_edge(["validate_data", "check_eligibility", "prefetch_programs"], "join_assessment")
         
         # Conditional edge: only proceed if validation passes
         workflow.add_conditional_edges(
-            "validate_data",
+            "join_assessment",
             self._should_proceed_after_validation,
             {
-                "proceed": "check_eligibility",
+                "proceed": "generate_recommendations",
                 "end": END  # End early if validation fails critically
             }
         )
         
-        workflow.add_edge("check_eligibility", "generate_recommendations")
         workflow.add_edge("generate_recommendations", "finalize")
         workflow.add_edge("finalize", END)
         
-        return workflow.compile()
+        # Checkpoint after every node so a failed run can resume where it stopped
+        return workflow.compile(checkpointer=MemorySaver())
     
-    def _extract_documents_node(self, state: WorkflowState) -> WorkflowState:
+    async def _extract_documents_node(self, state: WorkflowState) -> Dict[str, Any]:
         """
         Node 1: Document Extraction
         
-        Processes all uploaded documents and extracts structured data.
+        Processes all uploaded documents concurrently and extracts structured data.
         """
-        print(f"\n[ORCHESTRATOR] Stage 1: Extracting documents for applicant {state['applicant_id']}")
+        logger.info("Stage 1: Extracting documents for applicant %s", state['applicant_id'])
         
-        state['stage'] = 'extraction'
         extracted_data = {}
+        errors = []
+        documents = state.get('documents', [])
+        semaphore = asyncio.Semaphore(EXTRACTION_CONCURRENCY)
         
-        # Process each document
-        for doc in state.get('documents', []):
-            try:
-                # Call data extraction agent
-                result = data_extraction_agent.execute({
+        async def extract_one(doc: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await data_extraction_agent.aexecute({
                     'applicant_id': state['applicant_id'],
                     'doc_type': doc['type'],
-                    'file_path': doc['path']
+                    'file_path': doc['path'],
+                    'defer_write': True
                 })
+        
+        results = await asyncio.gather(
+            *(extract_one(doc) for doc in documents),
+            return_exceptions=True
+        )
+        # Store all document rows in one transaction
+        await asyncio.to_thread(db_manager.flush)
+        
+        # Merge in document order so later documents still win on conflicts
+        for doc, result in zip(documents, results):
+            if isinstance(result, Exception):
+                error_msg = f"Exception extracting {doc.get('type', 'unknown')}: {str(result)}"
+                errors.append(error_msg)
+                logger.warning(error_msg)
+            elif result['result']['success']:
+                # Merge extracted data
+                doc_data = result['result']['extracted_data']
+                extracted_data.update(doc_data)
                 
-                if result['result']['success']:
-                    # Merge extracted data
-                    doc_data = result['result']['extracted_data']
-                    extracted_data.update(doc_data)
-                    
-                    print(f"  ✓ Extracted {doc['type']}: {doc_data.get('summary', 'Success')}")
-                else:
-                    error_msg = f"Failed to extract {doc['type']}: {result['result'].get('error', 'Unknown error')}"
-                    state['errors'].append(error_msg)
-                    print(f"  ✗ {error_msg}")
-                    
-            except Exception as e:
-                error_msg = f"Exception extracting {doc.get('type', 'unknown')}: {str(e)}"
-                state['errors'].append(error_msg)
-                print(f"  ✗ {error_msg}")
+                logger.debug("Extracted %s: %s", doc['type'], doc_data.get('summary', 'Success'))
+            else:
+                error_msg = f"Failed to extract {doc['type']}: {result['result'].get('error', 'Unknown error')}"
+                errors.append(error_msg)
+                logger.warning(error_msg)
         
         # Add defaults from applicant data if extraction failed
-        if not extracted_data.get('monthly_income') and state['applicant_data'].get('monthly_income'):
-            extracted_data['monthly_income'] = state['applicant_data']['monthly_income']
-        
-        if not extracted_data.get('employment_status') and state['applicant_data'].get('employment_status'):
-            extracted_data['employment_status'] = state['applicant_data']['employment_status']
-        
-        if not extracted_data.get('total_assets') and state['applicant_data'].get('total_assets'):
-            extracted_data['total_assets'] = state['applicant_data']['total_assets']
+        applicant_data = state['applicant_data']
+        extracted_data.update({
+            field: applicant_data[field]
+            for field in FALLBACK_FIELDS
+            if applicant_data.get(field) and not extracted_data.get(field)
+        })
         
-        if not extracted_data.get('total_liabilities') and state['applicant_data'].get('total_liabilities'):
-            extracted_data['total_liabilities'] = state['applicant_data']['total_liabilities']
-        
-        if not extracted_data.get('credit_score') and state['applicant_data'].get('credit_score'):
-            extracted_data['credit_score'] = state['applicant_data']['credit_score']
-        
-        state['extracted_data'] = extracted_data
+        return {
+            'stage': 'extraction',
+            'extracted_data': extracted_data,
+            'errors': errors,
+            'pending_writes': [('extraction_complete', {'extracted_data': extracted_data})]
+        }
+    
+    def _route_entry(self, state: WorkflowState):
+        """
+        Entry router: extract documents if there are any, else start assessing.
         
-        # Update workflow state in database
-        db_manager.update_workflow_state(
-            state['applicant_id'],
-            'extraction_complete',
-            {'extracted_data': extracted_data}
-        )
+        Without documents, aprocess_application has already filled
+        extracted_data from the applicant data fallbacks.
+        """
+        if state['documents']:
+            return "extract_documents"
+        return self._dispatch_assessment(state)
+    
+    def _dispatch_assessment(self, state: WorkflowState) -> List[Send]:
+        """
+        Fan out to the parallel assessment branches.
         
-        return state
+        Each branch receives the post-extraction state and returns only the
+        keys it owns, so their updates merge without conflicts.
+        """
+        return [
+            Send("validate_data", state),
+            Send("check_eligibility", state),
+            Send("prefetch_programs", state)
+        ]
     
-    def _validate_data_node(self, state: WorkflowState) -> WorkflowState:
+    @node_handler("Validation exception", lambda error_msg: {
+        'validation_results': {
+            'is_valid': False,
+            'completeness_score': 0.0,
+            'issues': [error_msg]
+        }
+    })
+    async def _validate_data_node(self, state: WorkflowState) -> Dict[str, Any]:
         """
-        Node 2: Data Validation
+        Node 2a: Data Validation
         
         Validates extracted data for completeness and consistency.
         """
-        print(f"\n[ORCHESTRATOR] Stage 2: Validating data")
+        logger.info("Stage 2: Validating data")
         
-        state['stage'] = 'validation'
-        
-        try:
-            # Call data validation agent
-            result = data_validation_agent.execute({
-                'applicant_id': state['applicant_id'],
-                'extracted_data': state['extracted_data']
-            })
-            
-            validation_results = result['result']['validation_results']
-            state['validation_results'] = validation_results
-            
-            print(f"  Completeness: {validation_results['completeness_score']*100:.0f}%")
-            print(f"  Valid: {validation_results['is_valid']}")
-            
-            if validation_results['warnings']:
-                print(f"  Warnings: {len(validation_results['warnings'])}")
-                for warning in validation_results['warnings']:
-                    print(f"    - {warning}")
-            
-            if validation_results['issues']:
-                print(f"  Issues: {len(validation_results['issues'])}")
-                for issue in validation_results['issues']:
-                    print(f"    - {issue}")
-                    state['errors'].append(f"Validation: {issue}")
-            
-            # Update workflow state
-            db_manager.update_workflow_state(
-                state['applicant_id'],
-                'validation_complete',
-                {'validation_results': validation_results}
-            )
-            
-        except Exception as e:
-            error_msg = f"Validation exception: {str(e)}"
-            state['errors'].append(error_msg)
-            print(f"  ✗ {error_msg}")
-            state['validation_results'] = {
-                'is_valid': False,
-                'completeness_score': 0.0,
-                'issues': [error_msg]
+        # Nothing was extracted: skip the agent (and its LLM call), the gate ends the workflow
+        if not state['extracted_data']:
+            return {
+                'validation_results': {
+                    'is_valid': False,
+                    'completeness_score': 0.0,
+                    'issues': ['No extracted data'],
+                    'warnings': [],
+                    'requires_user_action': True
+                },
+                'errors': ['Validation: No extracted data']
             }
         
-        return state
+        # Call data validation agent
+        result = await data_validation_agent.aexecute({
+            'applicant_id': state['applicant_id'],
+            'extracted_data': state['extracted_data']
+        })
+        
+        validation_results = result['result']['validation_results']
+        
+        logger.info(
+            "Completeness: %.0f%%, valid: %s, warnings: %d, issues: %d",
+            validation_results['completeness_score'] * 100,
+            validation_results['is_valid'],
+            len(validation_results['warnings']),
+            len(validation_results['issues'])
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            for warning in validation_results['warnings']:
+                logger.debug("Warning: %s", warning)
+            for issue in validation_results['issues']:
+                logger.debug("Issue: %s", issue)
+        
+        return {
+            'validation_results': validation_results,
+            'errors': [f"Validation: {issue}" for issue in validation_results['issues']],
+            'pending_writes': [('validation_complete', {'validation_results': validation_results})]
+        }
     
     def _should_proceed_after_validation(self, state: WorkflowState) -> str:
         """
@@ -267,147 +421,172 @@ class OrchestratorAgent(BaseAgent):
         validation_results = state.get('validation_results', {})
         # End if requires_user_action is set (critical validation failure)
         if validation_results.get('requires_user_action', False):
-            print("\n[ORCHESTRATOR] ⚠️  User action required - ending workflow early")
+            logger.warning("User action required - ending workflow early")
             return "end"
         # Proceed only if validation passed
         if validation_results.get('is_valid', False):
             return "proceed"
         else:
-            print("\n[ORCHESTRATOR] ⚠️  Insufficient data - ending workflow early")
+            logger.warning("Insufficient data - ending workflow early")
             return "end"
     
-    def _check_eligibility_node(self, state: WorkflowState) -> WorkflowState:
+    @node_handler("Eligibility check exception", lambda error_msg: {
+        'eligibility_results': {
+            'eligibility_score': 0,
+            'decision': 'ERROR',
+            'confidence': 'NONE'
+        }
+    })
+    async def _check_eligibility_node(self, state: WorkflowState) -> Dict[str, Any]:
         """
-        Node 3: Eligibility Check
+        Node 2b: Eligibility Check
         
         Determines eligibility for social support.
         """
-        print(f"\n[ORCHESTRATOR] Stage 3: Checking eligibility")
+        logger.info("Stage 2: Checking eligibility")
+        
+        # Prepare applicant data
+        extracted = state['extracted_data'].get
+        applicant_data = {
+            'applicant_name': state.get('applicant_name', 'Unknown'),
+            'monthly_income': extracted('monthly_income', 0),
+            'employment_status': extracted('employment_status', 'unknown'),
+            'family_size': state['applicant_data'].get('family_size', 1),
+            'total_assets': extracted('total_assets', 0),
+            'total_liabilities': extracted('total_liabilities', 0),
+            'asset_liability_ratio': extracted('asset_liability_ratio', 0),
+            'credit_score': extracted('credit_score', 0)
+        }
         
-        state['stage'] = 'eligibility'
+        # Identical scoring inputs (retries, resubmissions) reuse the earlier score
+        features = tuple(applicant_data[key] for key in ELIGIBILITY_FEATURES)
+        with _eligibility_cache_lock:
+            scored = _eligibility_cache.get(features)
         
-        try:
-            # Prepare applicant data
-            applicant_data = {
-                'applicant_name': state["applicant_name"] if "applicant_name" in state else "Unknown",
-                'monthly_income': state['extracted_data'].get('monthly_income', 0),
-                'employment_status': state['extracted_data'].get('employment_status', 'unknown'),
-                'family_size': state['applicant_data'].get('family_size', 1),
-                'total_assets': state['extracted_data'].get('total_assets', 0),
-                'total_liabilities': state['extracted_data'].get('total_liabilities', 0),
-                'asset_liability_ratio': state['extracted_data'].get('asset_liability_ratio', 0),
-                'credit_score': state['extracted_data'].get('credit_score', 0)
-            }
-            
+        if scored is None:
             # Call eligibility check agent
-            result = eligibility_check_agent.execute({
+            result = await eligibility_check_agent.aexecute({
                 'applicant_data': applicant_data
             })
             
             eligibility_results = result['result']
-            state['eligibility_results'] = eligibility_results
-            
-            print(f"  Score: {eligibility_results['eligibility_score']}/100")
-            print(f"  Decision: {eligibility_results['decision']}")
-            print(f"  Confidence: {eligibility_results['confidence']}")
-            
-            # Update workflow state
-            db_manager.update_workflow_state(
-                state['applicant_id'],
-                'eligibility_complete',
-                {'eligibility_results': eligibility_results}
+            if eligibility_results.get('success'):
+                with _eligibility_cache_lock:
+                    _eligibility_cache[features] = _copy_scored(eligibility_results)
+        else:
+            eligibility_results = _copy_scored(scored)
+            eligibility_results['explanation'] = await eligibility_check_agent.explain_async(
+                applicant_data, scored['eligibility_score'], scored['decision']
             )
-            
-        except Exception as e:
-            error_msg = f"Eligibility check exception: {str(e)}"
-            state['errors'].append(error_msg)
-            print(f"  ✗ {error_msg}")
-            state['eligibility_results'] = {
-                'eligibility_score': 0,
-                'decision': 'ERROR',
-                'confidence': 'NONE'
-            }
         
-        return state
+        logger.info(
+            "Score: %s/100, decision: %s, confidence: %s",
+            eligibility_results['eligibility_score'],
+            eligibility_results['decision'],
+            eligibility_results['confidence']
+        )
+        
+        return {
+            'eligibility_results': eligibility_results,
+            'pending_writes': [('eligibility_complete', {'eligibility_results': eligibility_results})]
+        }
     
-    def _generate_recommendations_node(self, state: WorkflowState) -> WorkflowState:
+    async def _prefetch_programs_node(self, state: WorkflowState) -> Dict[str, Any]:
+        """
+        Node 2c: Program Matching
+        
+        Matches enablement programs from the applicant profile; only the
+        personalized advice has to wait for the eligibility decision.
+        """
+        extracted = state['extracted_data'].get
+        applicant_data = {
+            'monthly_income': extracted('monthly_income', 0),
+            'employment_status': extracted('employment_status', 'unknown')
+        }
+        return {'matched_programs': recommendation_agent.match_programs(applicant_data)}
+    
+    async def _join_assessment_node(self, state: WorkflowState) -> Dict[str, Any]:
+        """
+        Join point of the parallel assessment branches.
+        """
+        return {'stage': 'assessment'}
+    
+    
+    @node_handler("Recommendation exception", lambda error_msg: {
+        'stage': 'recommendations',
+        'recommendations': {
+            'priority_programs': [],
+            'personalized_advice': 'Unable to generate recommendations'
+        }
+    })
+    async def _generate_recommendations_node(self, state: WorkflowState) -> Dict[str, Any]:
         """
-        Node 4: Generate Recommendations
+        Node 3: Generate Recommendations
         
         Provides personalized economic enablement recommendations.
         """
-        print(f"\n[ORCHESTRATOR] Stage 4: Generating recommendations")
+        logger.info("Stage 3: Generating recommendations")
+        
+        # Prepare data
+        extracted = state['extracted_data'].get
+        applicant_data = {
+            'applicant_name': state.get('applicant_name', 'Unknown'),
+            'monthly_income': extracted('monthly_income', 0),
+            'employment_status': extracted('employment_status', 'unknown'),
+            'family_size': state['applicant_data'].get('family_size', 1)
+        }
         
-        state['stage'] = 'recommendations'
+        # Call recommendation agent
+        result = await recommendation_agent.aexecute({
+            'applicant_data': applicant_data,
+            'eligibility_result': state['eligibility_results'],
+            'matched_programs': state.get('matched_programs')
+        })
         
-        try:
-            # Prepare data
-            applicant_data = {
-                'applicant_name': state["applicant_name"] if "applicant_name" in state else "Unknown",
-                'monthly_income': state['extracted_data'].get('monthly_income', 0),
-                'employment_status': state['extracted_data'].get('employment_status', 'unknown'),
-                'family_size': state['applicant_data'].get('family_size', 1)
-            }
-            
-            # Call recommendation agent
-            result = recommendation_agent.execute({
-                'applicant_data': applicant_data,
-                'eligibility_result': state['eligibility_results']
-            })
-            
-            recommendations = result['result']['recommendations']
-            state['recommendations'] = recommendations
-            
-            print(f"  Total programs: {result['result']['total_programs']}")
-            for program in recommendations.get('priority_programs', []):
-                print(f"  - {program['category']} ({program['priority']} priority)")
-            
-            # Update workflow state
-            db_manager.update_workflow_state(
-                state['applicant_id'],
-                'recommendations_complete',
-                {'recommendations': recommendations}
-            )
-            
-        except Exception as e:
-            error_msg = f"Recommendation exception: {str(e)}"
-            state['errors'].append(error_msg)
-            print(f"  ✗ {error_msg}")
-            state['recommendations'] = {
-                'priority_programs': [],
-                'personalized_advice': 'Unable to generate recommendations'
-            }
+        recommendations = result['result']['recommendations']
+        recommendations['priority_programs'] = list(
+            itertools.islice(recommendations.get('priority_programs', ()), MAX_PRIORITY_PROGRAMS)
+        )
+        
+        logger.info("Total programs: %d", result['result']['total_programs'])
+        if logger.isEnabledFor(logging.DEBUG):
+            for program in recommendations['priority_programs']:
+                logger.debug("Program: %s (%s priority)", program['category'], program['priority'])
         
-        return state
+        return {
+            'stage': 'recommendations',
+            'recommendations': recommendations,
+            'pending_writes': [('recommendations_complete', {'recommendations': recommendations})]
+        }
     
-    def _finalize_node(self, state: WorkflowState) -> WorkflowState:
+    async def _finalize_node(self, state: WorkflowState) -> Dict[str, Any]:
         """
-        Node 5: Finalize Decision
+        Node 4: Finalize Decision
         
-        Creates final assessment and stores in database.
+        Creates final assessment and stores in database, together with the
+        queued workflow state updates in one transaction.
         """
-        print(f"\n[ORCHESTRATOR] Stage 5: Finalizing decision")
+        logger.info("Stage 4: Finalizing decision")
         
-        state['stage'] = 'finalized'
+        errors = []
         
         # Compile final decision
+        eligibility = state['eligibility_results'].get
         final_decision = {
             'applicant_id': state['applicant_id'],
             'applicant_name': state['applicant_data'].get('name', 'Unknown'),
-            'eligibility_score': state['eligibility_results'].get('eligibility_score', 0),
-            'decision': state['eligibility_results'].get('decision', 'PENDING'),
-            'reasoning': state['eligibility_results'].get('explanation', ''),
+            'eligibility_score': eligibility('eligibility_score', 0),
+            'decision': eligibility('decision', 'PENDING'),
+            'reasoning': eligibility('explanation', ''),
             'recommendations': state['recommendations'],
             'completed_at': datetime.now().isoformat(),
             'has_errors': len(state.get('errors', [])) > 0,
             'errors': state.get('errors', [])
         }
         
-        state['final_decision'] = final_decision
-        
         # Save assessment to database
         try:
-            assessment_id = db_manager.save_assessment({
+            assessment_id = await asyncio.to_thread(db_manager.save_assessment, {
                 'applicant_id': state['applicant_id'],
                 'eligibility_score': final_decision['eligibility_score'],
                 'decision': final_decision['decision'],
@@ -415,22 +594,23 @@ class OrchestratorAgent(BaseAgent):
                 'recommendations': state['recommendations']
             })
             
-            print(f"  ✓ Assessment saved: {assessment_id}")
-            print(f"  Final Decision: {final_decision['decision']}")
+            logger.info("Assessment saved: %s, final decision: %s", assessment_id, final_decision['decision'])
             
-            # Update workflow state
-            db_manager.update_workflow_state(
+            # Flush queued workflow state updates
+            await asyncio.to_thread(
+                db_manager.update_workflow_states_bulk,
                 state['applicant_id'],
-                'completed',
-                {'final_decision': final_decision}
+                state['pending_writes'] + [('completed', {'final_decision': final_decision})]
             )
             
         except Exception as e:
             error_msg = f"Failed to save assessment: {str(e)}"
-            state['errors'].append(error_msg)
-            print(f"  ✗ {error_msg}")
+            errors.append(error_msg)
+            logger.error(error_msg)
+            final_decision['has_errors'] = True
+            final_decision['errors'] = final_decision['errors'] + errors
         
-        return state
+        return {'stage': 'finalized', 'final_decision': final_decision, 'errors': errors}
     
     def process_application(
         self,
@@ -441,6 +621,21 @@ class OrchestratorAgent(BaseAgent):
         """
         Main entry point for processing an application.
         
+        Synchronous wrapper around aprocess_application() for callers
+        without a running event loop. Runs on the shared background loop
+        (see run_coroutine), so repeated calls reuse one async Ollama client.
+        """
+        return run_coroutine(self.aprocess_application(applicant_id, applicant_data, documents))
+    
+    async def aprocess_application(
+        self,
+        applicant_id: str,
+        applicant_data: Dict[str, Any],
+        documents: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Process an application asynchronously.
+        
         This initiates the LangGraph workflow.
         
         Args:
@@ -451,9 +646,7 @@ class OrchestratorAgent(BaseAgent):
         Returns:
             Final decision and recommendations
         """
-        print(f"\n{'='*60}")
-        print(f"ORCHESTRATOR: Processing application {applicant_id}")
-        print(f"{'='*60}")
+        logger.info("Processing application %s", applicant_id)
 
         # Initialize workflow state
         initial_state: WorkflowState = {
@@ -461,12 +654,17 @@ class OrchestratorAgent(BaseAgent):
             'applicant_name': applicant_data.get('name', 'Unknown'),
             'applicant_data': applicant_data,
             'documents': documents,
-            'extracted_data': {},
+            # Without documents the extraction node is skipped, so apply its fallbacks here
+            'extracted_data': {} if documents else {
+                field: applicant_data[field] for field in FALLBACK_FIELDS if applicant_data.get(field)
+            },
             'validation_results': {},
             'eligibility_results': {},
+            'matched_programs': {},
             'recommendations': {},
             'final_decision': {},
             'errors': [],
+            'pending_writes': [],
             'stage': 'initiated',
             'metadata': {
                 'started_at': datetime.now().isoformat(),
@@ -474,52 +672,135 @@ class OrchestratorAgent(BaseAgent):
             }
         }
         
+        # Each run gets its own checkpoint thread, so reruns for the same
+        # applicant don't feed into the previous run's reducers
+        thread_id = f"{applicant_id}:{uuid.uuid4().hex}"
+        config = {
+            'configurable': {'thread_id': thread_id},
+            'callbacks': list(_CALLBACKS)
+        }
+        
         # Run the workflow
         try:
-            from langfuse.langchain import CallbackHandler
-            langfuse_handler = CallbackHandler()
+            try:
+                final_state = await self.workflow.ainvoke(initial_state, config=config)
+            except Exception:
+                # Resume once from the last completed node instead of replaying the workflow
+                logger.warning("Workflow for %s failed, resuming from last checkpoint", applicant_id)
+                final_state = await self.workflow.ainvoke(None, config=config)
             
-            final_state = self.workflow.invoke(initial_state, config={
-                'callbacks': [langfuse_handler]})
+            # Workflows stopped by the validation gate still persist their stage
+            # updates, minus the speculative eligibility result, so the stored
+            # stage is where the workflow actually stopped
+            if final_state['stage'] != 'finalized':
+                pending_writes = [
+                    (stage, stage_data) for stage, stage_data in final_state['pending_writes']
+                    if stage not in SPECULATIVE_STAGES
+                ]
+                if pending_writes:
+                    await asyncio.to_thread(
+                        db_manager.update_workflow_states_bulk,
+                        applicant_id,
+                        pending_writes
+                    )
             
-            print(f"\n{'='*60}")
-            print(f"WORKFLOW COMPLETE")
-            print(f"{'='*60}")
-            print(f"Stages completed: {final_state['stage']}")
-            print(f"Decision: {final_state['final_decision'].get('decision', 'UNKNOWN')}")
-            print(f"Errors: {len(final_state.get('errors', []))}")
+            logger.info(
+                "Workflow complete for %s: stage %s, decision %s, %d errors",
+                applicant_id,
+                final_state['stage'],
+                final_state['final_decision'].get('decision', 'UNKNOWN'),
+                len(final_state.get('errors', []))
+            )
             
             return final_state['final_decision'], final_state['errors']
             
         except Exception as e:
-            print(f"\nX WORKFLOW FAILED: {str(e)}")
+            logger.exception("Workflow failed for %s", applicant_id)
             return {
                 'applicant_id': applicant_id,
                 'decision': 'ERROR',
                 'error': str(e),
                 'completed_at': datetime.now().isoformat()
             }
+        
+        finally:
+            self.workflow.checkpointer.delete_thread(thread_id)
 
+    
+    async def aprocess_applications(
+        self,
+        applications: List[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]],
+        concurrency: int = 16
+    ) -> List[Any]:
+        """
+        Process many applications concurrently (bulk ingestion, backfills).
+        
+        Args:
+            applications: (applicant_id, applicant_data, documents) tuples
+            concurrency: Maximum applications in flight at once
+            
+        Returns:
+            Results of aprocess_application, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run_one(application):
+            async with semaphore:
+                return await self.aprocess_application(*application)
+        
+        return await asyncio.gather(*(run_one(application) for application in applications))
+    
+    async def apipe(
+        self,
+        applications: List[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]],
+        concurrency: int = 16
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Like aprocess_applications, but yields (applicant_id, result) as each finishes.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run_one(application):
+            async with semaphore:
+                return application[0], await self.aprocess_application(*application)
+        
+        for finished in asyncio.as_completed([run_one(application) for application in applications]):
+            yield await finished
 
     def export_stategraph_mermaid(self) -> str:
         """
         Export the LangGraph workflow as a Mermaid diagram.
         
-        Args:
-            output_path: Path to save the mermaid file
+        Rendering the PNG goes through the Mermaid web service, so it is
+        skipped when the saved image was rendered from the same graph
+        (tracked by a hash of the Mermaid source next to the image).
             
         Returns:
             Path to the saved file
         """
-
-        png_data = self.workflow.get_graph().draw_mermaid_png()
         output_filename = "docs/stategraph_mermaid_output.png"
+        hash_filename = output_filename + ".sha256"
+        
+        graph = self.workflow.get_graph()
+        graph_hash = hashlib.sha256(graph.draw_mermaid().encode('utf-8')).hexdigest()
+        try:
+            with open(hash_filename) as f:
+                if f.read().strip() == graph_hash and os.path.exists(output_filename):
+                    return output_filename
+        except IOError:
+            pass  # No previous render
+        
+        png_data = graph.draw_mermaid_png()
         try:
             with open(output_filename, 'wb') as f:
                 f.write(png_data)
-            print(f"Image successfully saved to {output_filename}")
+            with open(hash_filename, 'w') as f:
+                f.write(graph_hash)
+            logger.info("Image successfully saved to %s", output_filename)
         except IOError as e:
-            print(f"Error saving image: {e}")
+            logger.error("Error saving image: %s", e)
+        
+        return output_filename
 
 # Global orchestrator instance
 orchestrator = OrchestratorAgent()
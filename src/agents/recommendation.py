@@ -10,12 +10,328 @@ This agent provides personalized economic enablement recommendations:
 Uses ReAct pattern with LLM for personalized recommendations.
 """
 
-from typing import Dict, Any, List
-import ollama
+from typing import Dict, Any, List, Tuple, NamedTuple
+import asyncio
+import logging
+import re
+
+import numpy as np
 
 from ..database import db_manager
 from .base_agent import BaseAgent, AgentState, AgentResponse
-from ..config import ollama_cloud_run, settings, ENABLEMENT_PROGRAMS
+from .llm_cache import SemanticCache, embed_text
+from ..config import (
+    ollama_cloud_run, settings, get_ollama_client, get_ollama_async_client,
+    UPSKILLING_ALL, UPSKILLING_TOP2, FINANCIAL_LITERACY, JOB_MATCHING_ALL, CAREER_TOP1, CAREER_TOP2,
+    PROGRAM_JOINED
+)
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the bucket kernel runs as plain Python."""
+        def decorator(func):
+            return func
+        return decorator
+
+logger = logging.getLogger(__name__)
+
+# Advice shown when the LLM is unavailable
+_FALLBACK_ADVICE = (
+    "Based on your profile, we've identified several programs that can help improve your economic situation. "
+    "We encourage you to explore the upskilling and job matching opportunities available to you. "
+    "Our team is here to support your journey toward financial stability."
+)
+
+class RecommendationPlan(NamedTuple):
+    """Programs and identified needs for one applicant segment."""
+    needs: str
+    upskilling: Tuple[str, ...]
+    job_matching: Tuple[str, ...]
+    career_counseling: Tuple[str, ...]
+    priority_programs: Tuple[Tuple[str, str, Tuple[str, ...]], ...]  # (category, priority, programs)
+
+
+# Employed applicants below this monthly income are steered to upskilling
+LOW_INCOME_LIMIT = 10000
+
+PLANS: Dict[str, RecommendationPlan] = {
+    'unemployed': RecommendationPlan(
+        needs="""
+            - PRIMARY: Job placement and career development
+            - SECONDARY: Skills training and upskilling
+            - TERTIARY: Financial management
+            """,
+        upskilling=UPSKILLING_TOP2,
+        job_matching=JOB_MATCHING_ALL,
+        career_counseling=CAREER_TOP1,
+        priority_programs=(
+            ('Job Matching', 'HIGH', JOB_MATCHING_ALL),
+            ('Upskilling', 'MEDIUM', UPSKILLING_TOP2),
+        )
+    ),
+    'low': RecommendationPlan(
+        needs="""
+            - PRIMARY: Upskilling for career advancement
+            - SECONDARY: Financial literacy
+            - TERTIARY: Additional income opportunities
+            """,
+        upskilling=UPSKILLING_ALL,
+        job_matching=(),
+        career_counseling=CAREER_TOP2,
+        priority_programs=(
+            ('Upskilling', 'HIGH', UPSKILLING_ALL),
+            ('Career Counseling', 'MEDIUM', CAREER_TOP2),
+        )
+    ),
+    'general': RecommendationPlan(
+        needs="""
+            - PRIMARY: Financial management and planning
+            - SECONDARY: Career counseling
+            - TERTIARY: Skills enhancement
+            """,
+        upskilling=FINANCIAL_LITERACY,
+        job_matching=(),
+        career_counseling=CAREER_TOP1,
+        priority_programs=(
+            ('Financial Literacy', 'MEDIUM', FINANCIAL_LITERACY),
+        )
+    ),
+}
+
+
+# Integer codes for act_batch: employment status -> status code, bucket id -> PLANS key
+_STATUS_CODES = {'unemployed': 0, 'seeking': 0, 'employed': 1}
+_OTHER_STATUS_CODE = 2
+_BUCKET_KEYS = ('unemployed', 'low', 'general')
+
+
+@njit(parallel=True, cache=True)
+def _assign_buckets(status_codes, income, low_income_limit):
+    """
+    Vectorized plan_bucket over status codes and incomes (parallel when numba is installed).
+    
+    Returns:
+        int8 bucket ids indexing _BUCKET_KEYS
+    """
+    n = status_codes.shape[0]
+    buckets = np.empty(n, dtype=np.int8)
+    for i in prange(n):
+        if status_codes[i] == 0:
+            buckets[i] = 0
+        elif status_codes[i] == 1 and income[i] < low_income_limit:
+            buckets[i] = 1
+        else:
+            buckets[i] = 2
+    return buckets
+
+
+if _NUMBA_AVAILABLE:
+    # Compile at import (and cache to disk) so the first batch doesn't pay for it
+    _assign_buckets(np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.float32), np.float32(LOW_INCOME_LIMIT))
+
+
+class ApplicantBatch(NamedTuple):
+    """
+    Column-wise (structure of arrays) view of a cohort of applicants.
+    
+    Numeric fields are contiguous arrays that feed _assign_buckets
+    directly; employment status is stored as _STATUS_CODES codes.
+    """
+    ids: np.ndarray
+    names: np.ndarray
+    income: np.ndarray
+    family_size: np.ndarray
+    status: np.ndarray
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]]) -> 'ApplicantBatch':
+        """Build a batch from column lists (see SQLiteManager.get_applicant_columns)."""
+        n = len(columns['id'])
+        return cls(
+            ids=np.asarray(columns['id'], dtype=object),
+            names=np.asarray(columns['name'], dtype=object),
+            income=np.fromiter((v or 0 for v in columns['monthly_income']), dtype=np.float32, count=n),
+            family_size=np.fromiter((v or 1 for v in columns['family_size']), dtype=np.int32, count=n),
+            status=np.fromiter(
+                (_STATUS_CODES.get(v, _OTHER_STATUS_CODE) for v in columns['employment_status']),
+                dtype=np.int8,
+                count=n
+            )
+        )
+    
+    @classmethod
+    def from_records(cls, applicants: List[Dict[str, Any]]) -> 'ApplicantBatch':
+        """Build a batch from applicant_data dicts."""
+        return cls.from_columns({
+            'id': [a.get('applicant_id') for a in applicants],
+            'name': [a.get('applicant_name') for a in applicants],
+            'monthly_income': [a.get('monthly_income', 0) for a in applicants],
+            'family_size': [a.get('family_size', 1) for a in applicants],
+            'employment_status': [a.get('employment_status', 'unknown') for a in applicants],
+        })
+    
+    @classmethod
+    def load(cls, applicant_ids: List[str]) -> 'ApplicantBatch':
+        """Load a batch of stored applicants with a single query."""
+        return cls.from_columns(db_manager.get_applicant_columns(applicant_ids))
+
+
+def plan_bucket(applicant_data: Dict[str, Any]) -> str:
+    """Return the PLANS key for an applicant's employment status and income."""
+    get = applicant_data.get
+    return _bucket_for(get('employment_status', 'unknown'), get('monthly_income', 0) or 0)
+
+
+def _bucket_for(employment_status: str, monthly_income: float) -> str:
+    """plan_bucket() for already extracted fields."""
+    if employment_status in ('unemployed', 'seeking'):
+        return 'unemployed'
+    if employment_status == 'employed' and monthly_income < LOW_INCOME_LIMIT:
+        return 'low'
+    return 'general'
+
+
+def _join_programs(programs) -> str:
+    """Comma-separated program names, from PROGRAM_JOINED for the standard program tuples."""
+    programs = tuple(programs)
+    joined = PROGRAM_JOINED.get(programs)
+    return joined if joined is not None else ', '.join(programs)
+
+
+# Advice asks for 3-4 sentences; generation stops after this many
+ADVICE_MAX_SENTENCES = 4
+
+# A sentence terminator followed by whitespace (so "5,000.00" does not count)
+_SENTENCE_END = re.compile(r'[.!?](?=\s)')
+
+
+# Invariant start of every advice prompt. Nothing applicant-specific may go
+# here: Ollama reuses the KV cache of a prompt prefix it has already
+# evaluated, so a stable preamble is only prefilled once per loaded model.
+_ADVICE_PREAMBLE = """
+                    You are a compassionate career counselor named RecommendationAgent for a government social support program.
+
+                    Write a personalized, encouraging message (3-4 sentences) for the applicant below that:
+                    1. Acknowledges the applicant's situation
+                    2. Highlights the most relevant programs
+                    3. Motivates them to take action
+                    4. Provides hope and support
+
+                    Be empathetic and practical. Do not greet or name the applicant; start with the message itself.
+"""
+
+
+def _advice_options() -> Dict[str, Any]:
+    """Generation options for personalized advice."""
+    return {
+        'num_predict': settings.ollama_num_predict,
+        'num_ctx': 2048,
+        'temperature': 0.4,
+        'stop': ['\n\n']
+    }
+
+
+def _sentence_budget_end(text: str) -> int:
+    """Index just past the ADVICE_MAX_SENTENCES-th sentence of text, or -1 if not reached."""
+    for count, match in enumerate(_SENTENCE_END.finditer(text), 1):
+        if count == ADVICE_MAX_SENTENCES:
+            return match.end()
+    return -1
+
+
+def _collect_advice(chunks) -> str:
+    """Accumulate a streamed generation, stopping once the sentence budget is met."""
+    text = ''
+    for chunk in chunks:
+        text += chunk['response']
+        end = _sentence_budget_end(text)
+        if end >= 0:
+            return text[:end]
+    return text
+
+
+async def _collect_advice_async(chunks) -> str:
+    """Async variant of _collect_advice; leaving the stream early closes the request."""
+    text = ''
+    async for chunk in chunks:
+        text += chunk['response']
+        end = _sentence_budget_end(text)
+        if end >= 0:
+            await chunks.aclose()
+            return text[:end]
+    return text
+
+
+# Next steps that follow the applicant-specific ones
+_STATIC_NEXT_STEPS = (
+    "3. Complete your profile in the government job portal",
+    "4. Follow up with your case officer within 2 weeks"
+)
+
+_REASONING_TEMPLATE = """
+        Recommendation Analysis for Applicant:
+        
+        Profile Assessment:
+        - Employment Status: {status}
+        - Monthly Income: AED {income:,.2f}
+        - Family Size: {family_size}
+        - Eligibility Decision: {decision}
+        - Eligibility Score: {score:.1f}
+        
+        Needs Identification:
+        {needs}
+        Generating personalized recommendations using LLM...
+        """
+
+# The applicant name never reaches the LLM or the shared caches; it is only
+# added to the finished advice with this fixed greeting
+_ADVICE_GREETING = "Dear {name},\n\n{advice}"
+
+# Splits a full name into the parts checked before a response is cached
+_NAME_SPLIT = re.compile(r"[\s\-']+")
+
+# Advice caches, one per (decision, employment status) so a semantic hit is
+# never served across decisions or employment situations
+_ADVICE_CACHES: Dict[Tuple[str, str], SemanticCache] = {}
+
+
+def _advice_cache(decision: str, employment_status: str) -> SemanticCache:
+    """Return the advice cache for a decision/employment partition."""
+    key = (decision, employment_status)
+    cache = _ADVICE_CACHES.get(key)
+    if cache is None:
+        cache = _ADVICE_CACHES.setdefault(key, SemanticCache(
+            max_entries=settings.semantic_cache_size,
+            threshold=settings.semantic_cache_threshold,
+            namespace=f"recommendation:{decision}:{employment_status}" if settings.llm_cache_persist else None,
+            ttl=settings.llm_cache_ttl_hours * 3600 or None
+        ))
+    return cache
+
+
+def _greet(advice: str, applicant_name: str) -> str:
+    """Address finished advice to the applicant, if their name is known."""
+    return _ADVICE_GREETING.format(name=applicant_name, advice=advice) if applicant_name else advice
+
+
+def _mentions_name(text: str, applicant_name: str) -> bool:
+    """Whether a response contains any part of the applicant's name (any case)."""
+    parts = [part for part in _NAME_SPLIT.split(applicant_name) if len(part) >= 3]
+    return bool(parts) and re.search(
+        r"\b(?:%s)\b" % "|".join(map(re.escape, parts)), text, re.IGNORECASE
+    ) is not None
+
+
+def _cache_advice(cache: SemanticCache, key: str, embedding, response: str, applicant_name: str):
+    """Cache a generated response unless it names the applicant; shared caches must never hold PII."""
+    if not (applicant_name and _mentions_name(response, applicant_name)):
+        cache.put(key, embedding, response)
 
 
 class RecommendationAgent(BaseAgent):
@@ -51,51 +367,22 @@ class RecommendationAgent(BaseAgent):
         """
         applicant_data = state.context.get('applicant_data', {})
         eligibility_result = state.context.get('eligibility_result', {})
-        
-        # Query knowledge base for enablement programs
-        query = f"""
-        Economic enablement programs for {applicant_data.get('employment_status', 'unknown')} 
-        applicant with family size {applicant_data.get('family_size', 1)}
-        """
+        get = applicant_data.get
+        status = get('employment_status', 'unknown')
+        income = get('monthly_income', 0) or 0
+        family_size = get('family_size', 1)
+        decision = eligibility_result.get('decision', 'PENDING')
+        score = eligibility_result.get('eligibility_score', 0)
             
-        reasoning = f"""
-        Recommendation Analysis for Applicant:
-        
-        Profile Assessment:
-        - Employment Status: {applicant_data.get('employment_status', 'unknown')}
-        - Monthly Income: AED {applicant_data.get('monthly_income', 0):,.2f}
-        - Family Size: {applicant_data.get('family_size', 1)}
-        - Eligibility Decision: {eligibility_result.get('decision', 'PENDING')}
-        - Eligibility Score: {eligibility_result.get('eligibility_score', 0):.1f}
-        
-        Needs Identification:
-        """
-        
-        # Determine primary needs based on profile
-        if applicant_data.get('employment_status') in ['unemployed', 'seeking']:
-            reasoning += """
-            - PRIMARY: Job placement and career development
-            - SECONDARY: Skills training and upskilling
-            - TERTIARY: Financial management
-            """
-        elif applicant_data.get('employment_status') == 'employed' and applicant_data.get('monthly_income', 0) < 8000:
-            reasoning += """
-            - PRIMARY: Upskilling for career advancement
-            - SECONDARY: Financial literacy
-            - TERTIARY: Additional income opportunities
-            """
-        else:
-            reasoning += """
-            - PRIMARY: Financial management and planning
-            - SECONDARY: Career counseling
-            - TERTIARY: Skills enhancement
-            """
-        
-        reasoning += f"""
-        Generating personalized recommendations using LLM...
-        """
-        
-        return reasoning
+        # Primary needs come from the applicant's plan
+        return _REASONING_TEMPLATE.format(
+            status=status,
+            income=income,
+            family_size=family_size,
+            decision=decision,
+            score=score,
+            needs=PLANS[_bucket_for(status, income)].needs
+        )
     
     def act(self, state: AgentState) -> Dict[str, Any]:
         """
@@ -107,68 +394,7 @@ class RecommendationAgent(BaseAgent):
         - Use LLM for personalization
         - Create actionable plan
         """
-        applicant_data = state.context.get('applicant_data', {})
-        eligibility_result = state.context.get('eligibility_result', {})
-        applicant_id = state.context.get('applicant_id', 'unknown')
-        
-        recommendations = {
-            'upskilling': [],
-            'job_matching': [],
-            'career_counseling': [],
-            'priority_programs': [],
-            'personalized_advice': ''
-        }
-        
-        employment_status = applicant_data.get('employment_status', 'unknown')
-        monthly_income = applicant_data.get('monthly_income', 0)
-        
-        # Rule-based program matching
-        if employment_status in ['unemployed', 'seeking']:
-            # High priority for job matching
-            recommendations['job_matching'] = ENABLEMENT_PROGRAMS['job_matching']
-            recommendations['priority_programs'].append({
-                'category': 'Job Matching',
-                'priority': 'HIGH',
-                'programs': ENABLEMENT_PROGRAMS['job_matching']
-            })
-            
-            # Medium priority for upskilling
-            recommendations['upskilling'] = ENABLEMENT_PROGRAMS['upskilling'][:2]
-            recommendations['priority_programs'].append({
-                'category': 'Upskilling',
-                'priority': 'MEDIUM',
-                'programs': ENABLEMENT_PROGRAMS['upskilling'][:2]
-            })
-            
-            # Career counseling
-            recommendations['career_counseling'] = [ENABLEMENT_PROGRAMS['career_counseling'][0]]
-            
-        elif employment_status == 'employed' and monthly_income < 10000:
-            # Focus on upskilling for advancement
-            recommendations['upskilling'] = ENABLEMENT_PROGRAMS['upskilling']
-            recommendations['priority_programs'].append({
-                'category': 'Upskilling',
-                'priority': 'HIGH',
-                'programs': ENABLEMENT_PROGRAMS['upskilling']
-            })
-            
-            # Career counseling for advancement
-            recommendations['career_counseling'] = ENABLEMENT_PROGRAMS['career_counseling'][:2]
-            recommendations['priority_programs'].append({
-                'category': 'Career Counseling',
-                'priority': 'MEDIUM',
-                'programs': ENABLEMENT_PROGRAMS['career_counseling'][:2]
-            })
-            
-        else:
-            # General support programs
-            recommendations['upskilling'] = [ENABLEMENT_PROGRAMS['upskilling'][1]]  # Financial literacy
-            recommendations['career_counseling'] = [ENABLEMENT_PROGRAMS['career_counseling'][0]]
-            recommendations['priority_programs'].append({
-                'category': 'Financial Literacy',
-                'priority': 'MEDIUM',
-                'programs': [ENABLEMENT_PROGRAMS['upskilling'][1]]
-            })
+        applicant_data, eligibility_result, recommendations = self._prepare_recommendations(state)
         
         # Generate personalized advice using LLM
         personalized_advice = self._generate_personalized_advice(
@@ -177,6 +403,78 @@ class RecommendationAgent(BaseAgent):
             recommendations
         )
         
+        return self._complete_recommendations(recommendations, personalized_advice)
+    
+    async def act_async(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Async variant of act() that awaits the personalized advice.
+        
+        Advice requests for concurrent applicants then overlap on the Ollama
+        server (see OLLAMA_NUM_PARALLEL in .env.example).
+        """
+        applicant_data, eligibility_result, recommendations = self._prepare_recommendations(state)
+        
+        personalized_advice = await self._generate_personalized_advice_async(
+            applicant_data,
+            eligibility_result,
+            recommendations
+        )
+        
+        return self._complete_recommendations(recommendations, personalized_advice)
+    
+    async def batch_recommend(self, states: List[AgentState]) -> List[Dict[str, Any]]:
+        """
+        Generate recommendations for several applicants concurrently.
+        
+        Args:
+            states: Agent states, one per applicant
+            
+        Returns:
+            Action results in the same order as states
+        """
+        return await asyncio.gather(*(self.act_async(state) for state in states))
+    
+    def act_batch(self, applicants) -> List[Dict[str, Any]]:
+        """
+        Match programs for a cohort of applicants at once.
+        
+        Bucket selection runs in a compiled kernel over the cohort's
+        employment codes and incomes; no LLM advice is generated.
+        
+        Args:
+            applicants: ApplicantBatch (e.g. ApplicantBatch.load(ids)) or
+                a list of applicant_data dicts
+            
+        Returns:
+            match_programs() results in the same order as the batch
+        """
+        if not isinstance(applicants, ApplicantBatch):
+            applicants = ApplicantBatch.from_records(applicants)
+        buckets = _assign_buckets(applicants.status, applicants.income, np.float32(LOW_INCOME_LIMIT))
+        
+        return [self._plan_recommendations(PLANS[_BUCKET_KEYS[bucket]]) for bucket in buckets]
+    
+    def _prepare_recommendations(self, state: AgentState):
+        """
+        Collect the inputs and the matched programs for an applicant.
+        
+        Returns:
+            (applicant_data, eligibility_result, recommendations)
+        """
+        applicant_data = state.context.get('applicant_data', {})
+        eligibility_result = state.context.get('eligibility_result', {})
+        
+        # Program matching may already have run in parallel with eligibility
+        matched_programs = state.context.get('matched_programs')
+        if matched_programs:
+            recommendations = dict(matched_programs)
+        else:
+            recommendations = self.match_programs(applicant_data)
+        
+        return applicant_data, eligibility_result, recommendations
+    
+    def _complete_recommendations(self, recommendations: Dict[str, Any], personalized_advice: str) -> Dict[str, Any]:
+        """Add advice and next steps and wrap the recommendations as an action result."""
         recommendations['personalized_advice'] = personalized_advice
         
         # Create actionable next steps
@@ -191,6 +489,31 @@ class RecommendationAgent(BaseAgent):
         
         return result
     
+    def match_programs(self, applicant_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rule-based matching of enablement programs to the applicant profile.
+        
+        Does not depend on the eligibility decision, so it can run before
+        (or alongside) the eligibility check.
+        
+        Returns:
+            Recommendations without personalized advice or next steps
+        """
+        return self._plan_recommendations(PLANS[plan_bucket(applicant_data)])
+    
+    def _plan_recommendations(self, plan: RecommendationPlan) -> Dict[str, Any]:
+        """Build a recommendations dict from a plan."""
+        return {
+            'upskilling': plan.upskilling,
+            'job_matching': plan.job_matching,
+            'career_counseling': plan.career_counseling,
+            'priority_programs': [
+                {'category': category, 'priority': priority, 'programs': programs}
+                for category, priority, programs in plan.priority_programs
+            ],
+            'personalized_advice': ''
+        }
+    
     def _generate_personalized_advice(
         self,
         applicant_data: Dict[str, Any],
@@ -199,78 +522,170 @@ class RecommendationAgent(BaseAgent):
     ) -> str:
         """
         Use LLM to generate personalized advice.
+        
+        Advice is cached per canonical profile (see _advice_cache): exact
+        prompt hits and, for local Ollama, embedding-similar prompts skip
+        the LLM call. Local generations are streamed and cut off after
+        ADVICE_MAX_SENTENCES sentences.
         """
         try:
-            prompt = f"""
-                    You are a compassionate career counselor named {self.name} for a government social support program.
-
-                    Applicant Profile:
-                    - Applicant Name: {applicant_data.get('applicant_name', 'Unknown')}
-                    - Employment Status: {applicant_data.get('employment_status', 'unknown')}
-                    - Monthly Income: AED {applicant_data.get('monthly_income', 0):,.2f}
-                    - Family Size: {applicant_data.get('family_size', 1)}
-                    - Eligibility Decision: {eligibility_result.get('decision', 'PENDING')}
-
-                    Recommended Programs:
-                    {self._format_recommendations_for_llm(recommendations)}
-
-                    Write a personalized, encouraging message (3-4 sentences) that:
-                    1. Acknowledges the applicant's situation
-                    2. Highlights the most relevant programs
-                    3. Motivates them to take action
-                    4. Provides hope and support
-
-                    Be empathetic and practical.
-                    """
+            applicant_name, key, cache = self._advice_lookup(applicant_data, eligibility_result, recommendations)
+            
+            cached = cache.get_exact(key)
+            if cached is not None:
+                return _greet(cached, applicant_name)
+            
+            embedding = None
+            if not settings.use_ollama_cloud:
+                try:
+                    embedding = embed_text(key)
+                except Exception:
+                    embedding = None  # No embedding model available: exact-match caching only
+            if embedding is not None:
+                cached = cache.get_similar(embedding)
+                if cached is not None:
+                    return _greet(cached, applicant_name)
+            
             if settings.use_ollama_cloud:
                 # print(f"\n[PROMPT to Ollama Cloud LLM]: {prompt}\n")
-                response = ollama_cloud_run(prompt)
+                response = ollama_cloud_run(key)
                 # print(f"\n[Ollama Cloud LLM Response]: {response}\n")
-
-                return response
             else:
-                response = ollama.generate(
+                response = _collect_advice(get_ollama_client().generate(
                     model=settings.ollama_model,
-                    prompt=prompt
+                    prompt=key,
+                    stream=True,
+                    options=_advice_options(),
+                    keep_alive=settings.ollama_keep_alive
+                ))
+            
+            _cache_advice(cache, key, embedding, response, applicant_name)
+            return _greet(response, applicant_name)
+            
+        except Exception as e:
+            # Fallback message
+            return _FALLBACK_ADVICE
+    
+    async def _generate_personalized_advice_async(
+        self,
+        applicant_data: Dict[str, Any],
+        eligibility_result: Dict[str, Any],
+        recommendations: Dict[str, Any]
+    ) -> str:
+        """
+        Async variant of _generate_personalized_advice using the Ollama AsyncClient.
+        """
+        try:
+            applicant_name, key, cache = self._advice_lookup(applicant_data, eligibility_result, recommendations)
+            
+            cached = cache.get_exact(key)
+            if cached is not None:
+                return _greet(cached, applicant_name)
+            
+            if settings.use_ollama_cloud:
+                response = await asyncio.to_thread(ollama_cloud_run, key)
+                _cache_advice(cache, key, None, response, applicant_name)
+                return _greet(response, applicant_name)
+            
+            client = get_ollama_async_client()
+            embedding = None
+            try:
+                embedding = np.asarray(
+                    (await client.embeddings(model=settings.ollama_embed_model, prompt=key))['embedding'],
+                    dtype=np.float32
                 )
-                
-                return response['response']
+            except Exception:
+                embedding = None  # No embedding model available: exact-match caching only
+            if embedding is not None:
+                cached = cache.get_similar(embedding)
+                if cached is not None:
+                    return _greet(cached, applicant_name)
+            
+            response = await _collect_advice_async(await client.generate(
+                model=settings.ollama_model,
+                prompt=key,
+                stream=True,
+                options=_advice_options(),
+                keep_alive=settings.ollama_keep_alive
+            ))
+            
+            _cache_advice(cache, key, embedding, response, applicant_name)
+            return _greet(response, applicant_name)
             
         except Exception as e:
             # Fallback message
-            return "Based on your profile, we've identified several programs that can help improve your economic situation. We encourage you to explore the upskilling and job matching opportunities available to you. Our team is here to support your journey toward financial stability."
+            return _FALLBACK_ADVICE
+    
+    def _advice_lookup(
+        self,
+        applicant_data: Dict[str, Any],
+        eligibility_result: Dict[str, Any],
+        recommendations: Dict[str, Any]
+    ):
+        """
+        Read the fields the advice depends on once.
+        
+        Returns:
+            (applicant name or '' if unknown, prompt (also the cache key), advice cache)
+        """
+        get = applicant_data.get
+        status = get('employment_status', 'unknown')
+        decision = eligibility_result.get('decision', 'PENDING')
+        key = self._build_advice_prompt(
+            status, get('monthly_income', 0) or 0, get('family_size', 1), decision, recommendations
+        )
+        applicant_name = get('applicant_name') or ''
+        if applicant_name == 'Unknown':
+            applicant_name = ''  # The workflow's placeholder for a missing name
+        return applicant_name, key, _advice_cache(decision, status)
+    
+    def _build_advice_prompt(
+        self,
+        employment_status: str,
+        monthly_income: float,
+        family_size: int,
+        decision: str,
+        recommendations: Dict[str, Any]
+    ) -> str:
+        """
+        Build the personalized advice prompt for the applicant's canonical profile.
+        
+        The applicant name is not part of the prompt (see _greet) and the
+        income is rounded to the nearest 500 AED, so applicants with the same
+        profile share one cache key. Every prompt starts with the same
+        _ADVICE_PREAMBLE, so the server can reuse its evaluated prefix.
+        """
+        monthly_income = round(monthly_income / 500) * 500
+        return _ADVICE_PREAMBLE + f"""
+                    Applicant Profile:
+                    - Employment Status: {employment_status}
+                    - Monthly Income: AED {monthly_income:,.2f}
+                    - Family Size: {family_size}
+                    - Eligibility Decision: {decision}
+
+                    Recommended Programs:
+                    {self._format_recommendations_for_llm(recommendations)}
+                    """
     
     def _format_recommendations_for_llm(self, recommendations: Dict[str, Any]) -> str:
         """Format recommendations for LLM prompt."""
-        formatted = []
-        
-        for program in recommendations.get('priority_programs', []):
-            formatted.append(
-                f"- {program['category']} (Priority: {program['priority']}): {', '.join(program['programs'])}"
-            )
-        print(f"\n[FORMATTED RECOMMENDATIONS]: {formatted}\n")
-        return "\n".join(formatted) if formatted else "General support programs"
+        formatted = "\n".join(
+            f"- {program['category']} (Priority: {program['priority']}): {_join_programs(program['programs'])}"
+            for program in recommendations.get('priority_programs', ())
+        )
+        logger.debug("Formatted recommendations: %s", formatted)
+        return formatted or "General support programs"
     
-    def _create_next_steps(self, recommendations: Dict[str, Any]) -> List[str]:
+    def _create_next_steps(self, recommendations: Dict[str, Any]) -> Tuple[str, ...]:
         """Create actionable next steps for applicant."""
-        steps = []
-        
-        if recommendations['priority_programs']:
-            top_priority = recommendations['priority_programs'][0]
-            steps.append(
-                f"1. Enroll in {top_priority['programs'][0]} - This is your highest priority"
-            )
-        
-        if len(recommendations['priority_programs']) > 1:
-            second_priority = recommendations['priority_programs'][1]
-            steps.append(
-                f"2. Schedule {second_priority['category'].lower()} session"
-            )
-        
-        steps.append("3. Complete your profile in the government job portal")
-        steps.append("4. Follow up with your case officer within 2 weeks")
+        priority_programs = recommendations['priority_programs']
+        head = ()
+        if priority_programs:
+            head = (f"1. Enroll in {priority_programs[0]['programs'][0]} - This is your highest priority",)
+            if len(priority_programs) > 1:
+                head += (f"2. Schedule {priority_programs[1]['category'].lower()} session",)
         
-        return steps
+        return head + _STATIC_NEXT_STEPS
 
 
 # Global instance
@@ -5,7 +5,11 @@ This module handles all configuration settings using Pydantic for validation
 and environment variables for flexibility.
 """
 
+import functools
 import os
+import threading
+import weakref
+from types import MappingProxyType
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -20,6 +24,16 @@ class Settings:
     Attributes:
         ollama_base_url: Base URL for Ollama LLM server
         ollama_model: Model name to use (e.g., llama3.2, mistral)
+        ollama_timeout: Seconds to wait for an Ollama response before giving up
+        ollama_num_predict: Token budget for short free-text generations (recommendation advice)
+        ollama_keep_alive: How long Ollama keeps the model (and its prompt cache) loaded after a request
+        llm_circuit_breaker_skip: LLM calls to skip after a failed call
+        ollama_embed_model: Embedding model used for semantic response caching
+        semantic_cache_threshold: Cosine similarity required for a semantic cache hit
+        semantic_cache_size: Maximum cached LLM responses per cache
+        llm_cache_persist: Persist cached LLM responses in SQLite across restarts
+        llm_cache_ttl_hours: Maximum age of a served cached LLM response (0 disables expiry)
+        eligibility_llm_always: Generate LLM explanations for clear-cut decisions too
         sqlite_db_path: Path to SQLite database file
         chroma_persist_dir: Directory for ChromaDB persistence
         langfuse_public_key: Langfuse public key for observability
@@ -36,6 +50,16 @@ class Settings:
         # Ollama LLM Configuration
         self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.ollama_model = os.getenv("OLLAMA_MODEL", "llama3.2")
+        self.ollama_timeout = float(os.getenv("OLLAMA_TIMEOUT", "60"))
+        self.ollama_num_predict = int(os.getenv("OLLAMA_NUM_PREDICT", "120"))
+        self.ollama_keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        self.llm_circuit_breaker_skip = int(os.getenv("LLM_CIRCUIT_BREAKER_SKIP", "5"))
+        self.ollama_embed_model = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+        self.semantic_cache_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        self.semantic_cache_size = int(os.getenv("SEMANTIC_CACHE_SIZE", "1000"))
+        self.llm_cache_persist = os.getenv("LLM_CACHE_PERSIST", "True").lower() == "true"
+        self.llm_cache_ttl_hours = float(os.getenv("LLM_CACHE_TTL_HOURS", "0"))
+        self.eligibility_llm_always = os.getenv("ELIGIBILITY_LLM_ALWAYS", "False").lower() == "true"
 
         self.ollama_cloud_api_key = os.getenv("OLLAMA_CLOUD_API_KEY", "")
         self.ollama_cloud_model = os.getenv("OLLAMA_CLOUD_MODEL", "gpt-oss:20b-cloud")
@@ -56,13 +80,26 @@ class Settings:
         # Paths
         self.upload_dir = os.getenv("UPLOAD_DIR", "./data/uploads")
         self.synthetic_data_dir = os.getenv("SYNTHETIC_DATA_DIR", "./data/synthetic")
+        
+        self._dirs_ready = False
     
     def ensure_directories(self):
-        """Create necessary directories if they don't exist."""
-        Path(self.upload_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.synthetic_data_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.chroma_persist_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.sqlite_db_path).parent.mkdir(parents=True, exist_ok=True)
+        """
+        Create necessary directories if they don't exist.
+        
+        Only the first call touches the filesystem; later calls (e.g. on
+        every Streamlit rerun) return immediately.
+        """
+        if self._dirs_ready:
+            return
+        for directory in (
+            self.upload_dir,
+            self.synthetic_data_dir,
+            self.chroma_persist_dir,
+            Path(self.sqlite_db_path).parent
+        ):
+            os.makedirs(directory, exist_ok=True)
+        self._dirs_ready = True
 
 
 # Global settings instance
@@ -103,12 +140,37 @@ ENABLEMENT_PROGRAMS = {
     ]
 }
 
-def ollama_cloud_run(prompt: str) -> str:
+# Immutable views of the programs, sliced once at import for the recommendation hot path
+ENABLEMENT_PROGRAMS_FROZEN = MappingProxyType({k: tuple(v) for k, v in ENABLEMENT_PROGRAMS.items()})
+UPSKILLING_ALL = ENABLEMENT_PROGRAMS_FROZEN['upskilling']
+UPSKILLING_TOP2 = UPSKILLING_ALL[:2]
+FINANCIAL_LITERACY = UPSKILLING_ALL[1:2]
+JOB_MATCHING_ALL = ENABLEMENT_PROGRAMS_FROZEN['job_matching']
+CAREER_TOP1 = ENABLEMENT_PROGRAMS_FROZEN['career_counseling'][:1]
+CAREER_TOP2 = ENABLEMENT_PROGRAMS_FROZEN['career_counseling'][:2]
+
+# Display strings of the program tuples above, joined once
+PROGRAM_JOINED = MappingProxyType({
+    programs: ', '.join(programs)
+    for programs in (
+        *ENABLEMENT_PROGRAMS_FROZEN.values(),
+        UPSKILLING_TOP2, FINANCIAL_LITERACY, CAREER_TOP1, CAREER_TOP2
+    )
+})
+
+@functools.cache
+def _get_ollama_cloud_client():
+    """Return the Ollama Cloud client, importing ollama and creating it on first use."""
     import ollama
-    client = ollama.Client(
-    host="https://ollama.com",
-    headers={'Authorization': 'Bearer ' + settings.ollama_cloud_api_key}
+    return ollama.Client(
+        host="https://ollama.com",
+        headers={'Authorization': 'Bearer ' + settings.ollama_cloud_api_key},
+        timeout=settings.ollama_timeout
     )
+
+
+def ollama_cloud_run(prompt: str) -> str:
+    client = _get_ollama_cloud_client()
     messages = [
         {
             'role': 'user',
@@ -117,4 +179,92 @@ def ollama_cloud_run(prompt: str) -> str:
     ]
 
     response = client.chat(settings.ollama_cloud_model, messages=messages)
-    return response['message']['content']
\ No newline at end of file
+    return response['message']['content']
+
+
+# Keep-alive pool shared by the local Ollama clients
+_OLLAMA_POOL_LIMITS = dict(max_keepalive_connections=16, max_connections=32)
+
+# Shared local Ollama client (see get_ollama_client); the lock keeps
+# concurrent first calls (e.g. validate_batch workers) from each building one
+_ollama_client = None
+_ollama_client_lock = threading.Lock()
+
+
+def get_ollama_client():
+    """
+    Return the shared client for the local Ollama server, created on first use.
+    
+    The client keeps a pooled keep-alive transport so repeated calls reuse
+    connections. Connects are not retried: callers fall back quickly when
+    Ollama is unreachable instead of paying a retry backoff on every call.
+    """
+    global _ollama_client
+    if _ollama_client is None:
+        with _ollama_client_lock:
+            if _ollama_client is None:
+                import httpx
+                import ollama
+                _ollama_client = ollama.Client(
+                    host=settings.ollama_base_url,
+                    timeout=settings.ollama_timeout,
+                    transport=httpx.HTTPTransport(limits=httpx.Limits(**_OLLAMA_POOL_LIMITS))
+                )
+    return _ollama_client
+
+
+# Async Ollama clients, one per event loop (httpx connections are loop-bound)
+_ollama_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_ollama_async_client():
+    """
+    Return the async client for the local Ollama server for the running event loop.
+    
+    Synchronous callers should go through run_coroutine(), so their work
+    always runs on the same long-lived loop and reuses one client.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    client = _ollama_async_clients.get(loop)
+    if client is None:
+        import httpx
+        import ollama
+        client = ollama.AsyncClient(
+            host=settings.ollama_base_url,
+            timeout=settings.ollama_timeout,
+            transport=httpx.AsyncHTTPTransport(limits=httpx.Limits(**_OLLAMA_POOL_LIMITS))
+        )
+        _ollama_async_clients[loop] = client
+    return client
+
+
+# Long-lived event loop for synchronous callers (see run_coroutine)
+_shared_loop = None
+_shared_loop_lock = threading.Lock()
+
+
+def run_coroutine(coro):
+    """
+    Run a coroutine to completion on the shared background event loop.
+    
+    Synchronous wrappers use this instead of asyncio.run(), which creates
+    and discards a loop per call; every new loop would also get its own
+    async Ollama client and connection pool that is never closed.
+    """
+    import asyncio
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("run_coroutine() cannot be called from a running event loop")
+    
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="shared-event-loop", daemon=True).start()
+            _shared_loop = loop
+    return asyncio.run_coroutine_threadsafe(coro, _shared_loop).result()
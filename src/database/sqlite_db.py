@@ -5,16 +5,212 @@ This module handles all structured data storage including applicant information,
 assessments, and document metadata.
 """
 
+import itertools
 import sqlite3
-import json
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from contextlib import contextmanager
+from types import MappingProxyType
+
+import orjson
 
 from ..config import settings
 
 
+# Applied to every pooled connection
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# orjson options matching what json.dumps accepted (numpy values, non-string keys)
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value for a JSON TEXT column."""
+    return orjson.dumps(value, option=_ORJSON_OPTIONS).decode()
+
+
+class LazyJSONRow(dict):
+    """
+    Row dict whose JSON columns are decoded on first access.
+    
+    Callers that only read scalar columns (e.g. an assessment's decision)
+    never pay for parsing the JSON payload. dict(row) copies the raw
+    column text; use row.copy() for a fully decoded plain dict.
+    """
+    
+    def __init__(self, row, json_fields: Tuple[str, ...]):
+        super().__init__(row)
+        self._undecoded = {field for field in json_fields if dict.get(self, field)}
+    
+    def _decode(self, key):
+        if key in self._undecoded:
+            self._undecoded.discard(key)
+            super().__setitem__(key, orjson.loads(super().__getitem__(key)))
+    
+    def _decode_all(self):
+        for key in tuple(self._undecoded):
+            self._decode(key)
+    
+    def __getitem__(self, key):
+        self._decode(key)
+        return super().__getitem__(key)
+    
+    def get(self, key, default=None):
+        self._decode(key)
+        return super().get(key, default)
+    
+    def __setitem__(self, key, value):
+        self._undecoded.discard(key)
+        super().__setitem__(key, value)
+    
+    def values(self):
+        self._decode_all()
+        return super().values()
+    
+    def items(self):
+        self._decode_all()
+        return super().items()
+    
+    def copy(self):
+        self._decode_all()
+        return dict(self)
+    
+    def __repr__(self):
+        self._decode_all()
+        return super().__repr__()
+
+
+# Deferred writes are flushed automatically once this many are queued
+_FLUSH_THRESHOLD = 64
+
+# Integer codes of the assessment decisions (assessments.decision_code)
+DECISION_CODES = MappingProxyType({
+    'APPROVED': 0,
+    'DECLINED': 1,
+    'UNDER_REVIEW': 2,
+    'PENDING': 3,
+    'ERROR': 4
+})
+
+# Workflow stages in order (workflow_state.current_step_idx is the index)
+WORKFLOW_STEPS = (
+    'extraction_complete',
+    'validation_complete',
+    'eligibility_complete',
+    'recommendations_complete',
+    'completed'
+)
+_STEP_INDEX = MappingProxyType({step: i for i, step in enumerate(WORKFLOW_STEPS)})
+
+# Typed columns hoisted out of the JSON blobs: name -> (type, backfill expression)
+_ASSESSMENT_TYPED_COLUMNS = {
+    'decision_code': ('INTEGER', "CASE decision " + " ".join(
+        f"WHEN '{decision}' THEN {code}" for decision, code in DECISION_CODES.items()
+    ) + " END"),
+    'score_int': ('INTEGER', "CAST(ROUND(eligibility_score * 10) AS INTEGER)"),
+}
+_WORKFLOW_TYPED_COLUMNS = {
+    'current_step_idx': ('INTEGER', "CASE current_stage " + " ".join(
+        f"WHEN '{step}' THEN {i}" for step, i in _STEP_INDEX.items()
+    ) + " END"),
+}
+
+
+_ID_COUNTER = itertools.count()
+_BASE36_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def _base36(value: int) -> str:
+    """Lower-case base-36 representation of a non-negative integer."""
+    digits = []
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(_BASE36_DIGITS[remainder])
+        if not value:
+            return ''.join(reversed(digits))
+
+
+def _mkid(prefix: str) -> str:
+    """
+    Generate a record ID: prefix, base-36 wall clock in ns, per-process sequence.
+    
+    Unlike the old second-resolution timestamps, IDs created in the same
+    instant never collide within a process, and they still sort by time.
+    """
+    return f"{prefix}_{_base36(time.time_ns())}_{next(_ID_COUNTER)}"
+
+
+def _score_int(score: Optional[float]) -> Optional[int]:
+    """Eligibility score in tenths of a point, as stored in assessments.score_int."""
+    return None if score is None else int(round(score * 10))
+
+
+_SQL_GET_APPLICANT = """
+    SELECT id, name, emirates_id, family_size, monthly_income, employment_status, contact_info
+    FROM applicants WHERE id = ?
+"""
+
+_SQL_GET_APPLICANT_COLUMNS = """
+    SELECT id, name, monthly_income, family_size, employment_status
+    FROM applicants WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+_SQL_GET_ASSESSMENT = """
+    SELECT id, applicant_id, eligibility_score, decision, decision_code, score_int,
+           reasoning, recommendations, created_at
+    FROM assessments WHERE applicant_id = ?
+    ORDER BY created_at DESC LIMIT 1
+"""
+
+_SQL_GET_APPLICANT_WITH_ASSESSMENT = """
+    SELECT a.id, a.name, a.emirates_id, a.family_size, a.monthly_income, a.employment_status, a.contact_info,
+           s.id AS assessment_id, s.eligibility_score, s.decision, s.decision_code, s.score_int,
+           s.reasoning, s.recommendations, s.created_at AS assessed_at
+    FROM applicants a
+    LEFT JOIN assessments s ON s.id = (
+        SELECT id FROM assessments WHERE applicant_id = a.id
+        ORDER BY created_at DESC LIMIT 1
+    )
+    WHERE a.id = ?
+"""
+
+_SQL_GET_WORKFLOW_STATE = """
+    SELECT id, applicant_id, current_stage, current_step_idx, stage_data, created_at, updated_at
+    FROM workflow_state WHERE applicant_id = ?
+"""
+
+_SQL_INSERT_DOCUMENT = """
+    INSERT INTO documents (id, applicant_id, doc_type, file_path, 
+                         extracted_data, validation_status)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_ASSESSMENT = """
+    INSERT INTO assessments (id, applicant_id, eligibility_score, 
+                           decision, reasoning, recommendations, decision_code, score_int)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_WORKFLOW_STATE = """
+    INSERT INTO workflow_state (id, applicant_id, current_stage, stage_data, current_step_idx)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(applicant_id) DO UPDATE SET
+        current_stage = excluded.current_stage,
+        stage_data = excluded.stage_data,
+        current_step_idx = excluded.current_step_idx,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
 class SQLiteManager:
     """
     Manages SQLite database operations for the application.
@@ -34,22 +230,126 @@ class SQLiteManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path or settings.sqlite_db_path
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        self._initialize_database()
+        self._local = threading.local()
+        self._pending: List[Tuple[str, tuple]] = []  # (sql, params) of deferred writes
+        self._pending_lock = threading.Lock()
+        
+        # The schema is created on first use, not at construction, so that
+        # importing the module (e.g. at UI start-up) touches no files
+        self._initialized = False
+        self._initializing = False
+        self._init_lock = threading.RLock()
+    
+    def _ensure_initialized(self):
+        """Create the database directory and schema once, on first connection."""
+        with self._init_lock:
+            if self._initialized or self._initializing:
+                return  # Done, or this thread is the one initializing
+            self._initializing = True
+            try:
+                if self.db_path == settings.sqlite_db_path:
+                    settings.ensure_directories()
+                else:
+                    Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._initialize_database()
+                self._initialized = True
+            finally:
+                self._initializing = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection, opening it on first use.
+        
+        Connections run in autocommit mode (transactions are managed by
+        get_connection) with WAL journaling, so readers never block the
+        writer.
+        """
+        if not self._initialized:
+            self._ensure_initialized()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=256
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
     
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def get_connection(self, immediate: bool = True):
+        """
+        Context manager for a transaction on this thread's pooled connection.
+        
+        Args:
+            immediate: Take the write lock up front (BEGIN IMMEDIATE); pass
+                False for read-only work
+        """
+        conn = self._connect()
+        if conn.in_transaction:
+            # Nested use joins the enclosing transaction
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
         try:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
+            conn.execute("COMMIT")
+        except BaseException:
+            # Also on KeyboardInterrupt/CancelledError/GeneratorExit, so the
+            # pooled connection is never left inside an open transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+    
+    def flush(self):
+        """Write all deferred rows, one executemany per statement, in a single transaction."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        batches: Dict[str, List[tuple]] = {}
+        for sql, params in pending:
+            batches.setdefault(sql, []).append(params)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for sql, rows in batches.items():
+                cursor.executemany(sql, rows)
+    
+    def _write(self, sql: str, params: tuple, defer: bool):
+        """Execute a single-row write now, or queue it for the next flush()."""
+        if not defer:
+            with self.get_connection() as conn:
+                conn.execute(sql, params)
+            return
+        with self._pending_lock:
+            self._pending.append((sql, params))
+            full = len(self._pending) >= _FLUSH_THRESHOLD
+        if full:
+            self.flush()
+    
+    @staticmethod
+    def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """
+        Cursor that returns plain tuples.
+        
+        Connections default to sqlite3.Row for name-based access; scalar
+        and column-wise reads index positionally and skip building Rows.
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor
+    
+    def close(self):
+        """Close this thread's pooled connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
             conn.close()
+            self._local.conn = None
     
     def _initialize_database(self):
         """Create database tables if they don't exist."""
@@ -80,6 +380,8 @@ class SQLiteManager:
                     decision TEXT,
                     reasoning TEXT,
                     recommendations TEXT,
+                    decision_code INTEGER,
+                    score_int INTEGER,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (applicant_id) REFERENCES applicants(id)
                 )
@@ -106,11 +408,60 @@ class SQLiteManager:
                     applicant_id TEXT NOT NULL,
                     current_stage TEXT,
                     stage_data TEXT,
+                    current_step_idx INTEGER,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (applicant_id) REFERENCES applicants(id)
                 )
             """)
+            
+            # LLM response cache (see agents.llm_cache)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key_hash TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    embedding BLOB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_namespace ON llm_cache (namespace, created_at)"
+            )
+            
+            # Typed columns added after the first release
+            self._add_missing_columns(cursor, 'assessments', _ASSESSMENT_TYPED_COLUMNS)
+            self._add_missing_columns(cursor, 'workflow_state', _WORKFLOW_TYPED_COLUMNS)
+            
+            # Latest assessment per applicant is an index lookup
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_assess_applicant_created ON assessments (applicant_id, created_at DESC)"
+            )
+            
+            # One workflow state row per applicant (the target of the UPSERT);
+            # keep only the latest row where older databases have duplicates
+            cursor.execute("""
+                DELETE FROM workflow_state WHERE rowid NOT IN (
+                    SELECT MAX(rowid) FROM workflow_state GROUP BY applicant_id
+                )
+            """)
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_workflow_state_applicant ON workflow_state (applicant_id)"
+            )
+    
+    def _add_missing_columns(self, cursor: sqlite3.Cursor, table: str, columns: Dict[str, Tuple[str, str]]):
+        """
+        Add columns that an existing table predates and backfill them.
+        
+        Args:
+            columns: column name -> (SQL type, backfill expression over the existing columns)
+        """
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for name, (sql_type, backfill) in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+                cursor.execute(f"UPDATE {table} SET {name} = {backfill}")
     
     def create_applicant(self, applicant_data: Dict[str, Any]) -> str:
         """
@@ -124,7 +475,7 @@ class SQLiteManager:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            applicant_id = applicant_data.get('id', f"APP_{datetime.now().strftime('%Y%m%d%H%M%S')}")
+            applicant_id = applicant_data.get('id') or _mkid('APP')
             
             cursor.execute("""
                 INSERT INTO applicants (id, name, emirates_id, family_size, 
@@ -137,139 +488,185 @@ class SQLiteManager:
                 applicant_data.get('family_size'),
                 applicant_data.get('monthly_income'),
                 applicant_data.get('employment_status'),
-                json.dumps(applicant_data.get('contact_info', {}))
+                _dumps(applicant_data.get('contact_info', {}))
             ))
             
             return applicant_id
     
     def get_applicant(self, applicant_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve applicant information by ID."""
-        with self.get_connection() as conn:
+        with self.get_connection(immediate=False) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM applicants WHERE id = ?", (applicant_id,))
+            cursor.execute(_SQL_GET_APPLICANT, (applicant_id,))
             row = cursor.fetchone()
             
             if row:
                 return dict(row)
             return None
     
-    def save_document(self, doc_data: Dict[str, Any]) -> str:
+    def get_applicant_columns(self, applicant_ids: List[str]) -> Dict[str, List[Any]]:
+        """
+        Retrieve the scoring fields of many applicants in one query, column-wise.
+        
+        Returns:
+            Dictionary of column name -> values (one per applicant found, in table order)
+        """
+        with self.get_connection(immediate=False) as conn:
+            cursor = self._tuple_cursor(conn)
+            rows = cursor.execute(_SQL_GET_APPLICANT_COLUMNS, (_dumps(list(applicant_ids)),)).fetchall()
+        columns = ('id', 'name', 'monthly_income', 'family_size', 'employment_status')
+        values = zip(*rows) if rows else ((),) * len(columns)
+        return {column: list(column_values) for column, column_values in zip(columns, values)}
+    
+    def save_document(self, doc_data: Dict[str, Any], defer: bool = False) -> str:
         """
         Save document metadata.
         
         Args:
             doc_data: Document information including type, path, extracted data
+            defer: Queue the row for the next flush() instead of writing now
             
         Returns:
             Document ID
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            doc_id = doc_data.get('id', f"DOC_{datetime.now().strftime('%Y%m%d%H%M%S%f')}")
-            
-            cursor.execute("""
-                INSERT INTO documents (id, applicant_id, doc_type, file_path, 
-                                     extracted_data, validation_status)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                doc_id,
-                doc_data.get('applicant_id'),
-                doc_data.get('doc_type'),
-                doc_data.get('file_path'),
-                json.dumps(doc_data.get('extracted_data', {})),
-                doc_data.get('validation_status', 'pending')
-            ))
-            
-            return doc_id
+        doc_id = doc_data.get('id') or _mkid('DOC')
+        self._write(_SQL_INSERT_DOCUMENT, (
+            doc_id,
+            doc_data.get('applicant_id'),
+            doc_data.get('doc_type'),
+            doc_data.get('file_path'),
+            _dumps(doc_data.get('extracted_data', {})),
+            doc_data.get('validation_status', 'pending')
+        ), defer)
+        
+        return doc_id
     
-    def save_assessment(self, assessment_data: Dict[str, Any]) -> str:
+    def save_assessment(self, assessment_data: Dict[str, Any], defer: bool = False) -> str:
         """
         Save assessment results.
         
         Args:
             assessment_data: Assessment results including score, decision, reasoning
+            defer: Queue the row for the next flush() instead of writing now
             
         Returns:
             Assessment ID
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            assessment_id = assessment_data.get('id', f"ASS_{datetime.now().strftime('%Y%m%d%H%M%S')}")
-            
-            cursor.execute("""
-                INSERT INTO assessments (id, applicant_id, eligibility_score, 
-                                       decision, reasoning, recommendations)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                assessment_id,
-                assessment_data.get('applicant_id'),
-                assessment_data.get('eligibility_score'),
-                assessment_data.get('decision'),
-                assessment_data.get('reasoning'),
-                json.dumps(assessment_data.get('recommendations', []))
-            ))
-            
-            return assessment_id
+        assessment_id = assessment_data.get('id') or _mkid('ASS')
+        self._write(_SQL_INSERT_ASSESSMENT, (
+            assessment_id,
+            assessment_data.get('applicant_id'),
+            assessment_data.get('eligibility_score'),
+            assessment_data.get('decision'),
+            assessment_data.get('reasoning'),
+            _dumps(assessment_data.get('recommendations', [])),
+            DECISION_CODES.get(assessment_data.get('decision')),
+            _score_int(assessment_data.get('eligibility_score'))
+        ), defer)
+        
+        return assessment_id
     
     def get_assessment(self, applicant_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve assessment for an applicant."""
-        with self.get_connection() as conn:
+        with self.get_connection(immediate=False) as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM assessments WHERE applicant_id = ? ORDER BY created_at DESC LIMIT 1",
-                (applicant_id,)
-            )
+            cursor.execute(_SQL_GET_ASSESSMENT, (applicant_id,))
             row = cursor.fetchone()
             
             if row:
-                result = dict(row)
-                if result.get('recommendations'):
-                    result['recommendations'] = json.loads(result['recommendations'])
-                return result
+                return LazyJSONRow(row, ('recommendations',))
+            return None
+    
+    def get_applicant_with_latest_assessment(self, applicant_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an applicant and their latest assessment in one query.
+        
+        Assessment fields are None when the applicant has not been assessed;
+        the assessment's own id and timestamp are returned as assessment_id
+        and assessed_at.
+        """
+        with self.get_connection(immediate=False) as conn:
+            row = conn.execute(_SQL_GET_APPLICANT_WITH_ASSESSMENT, (applicant_id,)).fetchone()
+            
+            if row:
+                return LazyJSONRow(row, ('recommendations',))
             return None
     
     def update_workflow_state(self, applicant_id: str, stage: str, stage_data: Dict[str, Any]):
         """Update workflow state for an applicant."""
+        state_id = _mkid('WF')
+        self._write(_SQL_UPSERT_WORKFLOW_STATE, (
+            state_id, applicant_id, stage, _dumps(stage_data), _STEP_INDEX.get(stage)
+        ), False)
+    
+    def update_workflow_states_bulk(self, applicant_id: str, updates: List[Tuple[str, Dict[str, Any]]]):
+        """
+        Apply a sequence of workflow state updates in a single transaction.
+        
+        Args:
+            applicant_id: Applicant the updates belong to
+            updates: (stage, stage_data) pairs in the order they happened
+        """
+        if not updates:
+            return
+        
+        state_id = _mkid('WF')
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if workflow state exists
-            cursor.execute(
-                "SELECT id FROM workflow_state WHERE applicant_id = ?",
-                (applicant_id,)
-            )
-            existing = cursor.fetchone()
-            
-            if existing:
-                cursor.execute("""
-                    UPDATE workflow_state 
-                    SET current_stage = ?, stage_data = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE applicant_id = ?
-                """, (stage, json.dumps(stage_data), applicant_id))
-            else:
-                state_id = f"WF_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-                cursor.execute("""
-                    INSERT INTO workflow_state (id, applicant_id, current_stage, stage_data)
-                    VALUES (?, ?, ?, ?)
-                """, (state_id, applicant_id, stage, json.dumps(stage_data)))
+            conn.executemany(_SQL_UPSERT_WORKFLOW_STATE, [
+                (state_id, applicant_id, stage, _dumps(stage_data), _STEP_INDEX.get(stage))
+                for stage, stage_data in updates
+            ])
     
     def get_workflow_state(self, applicant_id: str) -> Optional[Dict[str, Any]]:
         """Get current workflow state for an applicant."""
-        with self.get_connection() as conn:
+        with self.get_connection(immediate=False) as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM workflow_state WHERE applicant_id = ?",
-                (applicant_id,)
-            )
+            cursor.execute(_SQL_GET_WORKFLOW_STATE, (applicant_id,))
             row = cursor.fetchone()
             
             if row:
-                result = dict(row)
-                if result.get('stage_data'):
-                    result['stage_data'] = json.loads(result['stage_data'])
-                return result
+                return LazyJSONRow(row, ('stage_data',))
             return None
 
+    
+    def get_cached_llm_response(self, key_hash: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Return the cached LLM response for a prompt hash, if any (and younger than max_age seconds)."""
+        with self.get_connection(immediate=False) as conn:
+            cursor = self._tuple_cursor(conn)
+            if max_age is None:
+                cursor.execute("SELECT response FROM llm_cache WHERE key_hash = ?", (key_hash,))
+            else:
+                cursor.execute("""
+                    SELECT response FROM llm_cache
+                    WHERE key_hash = ? AND created_at >= datetime('now', ?)
+                """, (key_hash, f"-{int(max_age)} seconds"))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    
+    def get_cached_llm_entries(self, namespace: str, limit: int,
+                               max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return the most recent cached LLM entries of a namespace, oldest first."""
+        with self.get_connection(immediate=False) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT prompt, response, embedding,
+                       CAST(strftime('%s', created_at) AS REAL) AS created_epoch
+                FROM llm_cache
+                WHERE namespace = ? AND (? IS NULL OR created_at >= datetime('now', ?))
+                ORDER BY created_at DESC LIMIT ?
+            """, (namespace, max_age, f"-{int(max_age or 0)} seconds", limit))
+            return [dict(row) for row in reversed(cursor.fetchall())]
+    
+    def save_cached_llm_response(self, key_hash: str, namespace: str, prompt: str,
+                                 response: str, embedding: Optional[bytes] = None):
+        """Store an LLM response (and optional prompt embedding) in the cache table."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO llm_cache (key_hash, namespace, prompt, response, embedding)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key_hash, namespace, prompt, response, embedding))
+
 
 # Global database instance
 db_manager = SQLiteManager()
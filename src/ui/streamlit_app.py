@@ -13,16 +13,16 @@ import sys
 from pathlib import Path
 from datetime import datetime
 import json
-import threading
-import time
+import re
+import shutil
+import string
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.agents import orchestrator
 from src.database import db_manager
-from src.config import ollama_cloud_run, settings
-import ollama
+from src.config import ollama_cloud_run, get_ollama_client, settings
 
 # Ensure directories exist
 settings.ensure_directories()
@@ -45,29 +45,29 @@ if 'processing' not in st.session_state:
     st.session_state.processing = False
 if 'decision' not in st.session_state:
     st.session_state.decision = None
+if 'decision_json' not in st.session_state:
+    st.session_state.decision_json = None
 if 'errors' not in st.session_state:
     st.session_state.errors = None
+if 'error_detail' not in st.session_state:
+    st.session_state.error_detail = None
 
 
-def chat_with_llm(prompt):
-    """Send a message to the local LLM for conversation."""
-    try:
-        # Add chat history (last 10 messages) to the prompt for context
-        history = st.session_state.get('messages', [])[-10:]
-        history_text = "\n".join([
-            f"{msg['role'].capitalize()}: {msg['content']}" for msg in history if msg['role'] in ['user', 'assistant']
-        ])
-        prompt = f"""You are a helpful AI assistant for a government social support application system.
+# Chat messages that ask to run an application (substring match, any case)
+INTENT_RE = re.compile(r"process|submit|apply|check eligibility", re.IGNORECASE)
+
+# Chat prompt, parsed once at load; chat_with_llm only substitutes the fields
+CHAT_PROMPT = string.Template("""You are a helpful AI assistant for a government social support application system.
 
                         Chat history:
-                        {history_text}
+                        $history_text
 
-                        User message: {prompt}
+                        User message: $prompt
 
                         Provide a helpful, empathetic response. If the user asks about the application process, explain that they can:
                         1. Upload required documents (bank statements, resume, Emirates ID, assets/liabilities, credit report)
                         2. Fill in basic information
-                        3. Click \"Process Application\" to run the AI assessment
+                        3. Click "Process Application" to run the AI assessment
                         
                         Please keep your response concise and relevant to social support applications."
                         
@@ -75,29 +75,61 @@ def chat_with_llm(prompt):
                         
                         If the user asks about their application status, provide information based on the current state:
     
-                        The applicant ID is {st.session_state.applicant_id}." or ""
+                        The applicant ID is $applicant_id." or ""
                         If user has any follow up questions, assist them accordingly based on the final decision below:
-                        "Final Decision: {st.session_state.decision if st.session_state.decision else 'N/A'}."
+                        "Final Decision: $decision."
                         
-                        Here are the session state errors if any: {st.session_state.errors if st.session_state.errors else 'N/A'}.
-                        Keep responses brief and friendly."""
-        if settings.use_ollama_cloud:
-            # print(f"\n[PROMPT to Ollama Cloud LLM]: {prompt}\n")
-            response = ollama_cloud_run(prompt)
-            # print(f"\n[Ollama Cloud LLM Response]: {response}\n")
-            
-            return response
-        else:
-            response = ollama.generate(
-                model=settings.ollama_model,
-                prompt=prompt
-            )
+                        Here are the session state errors if any: $errors.
+                        Keep responses brief and friendly.""")
+
+
+# st.cache_data rather than functools.lru_cache: Streamlit re-executes this
+# script on every interaction, which would discard a module-level cache.
+# Exceptions propagate, so failed calls are never cached.
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_generate(model: str, prompt: str, use_cloud: bool) -> str:
+    """Generate a chat reply for a full prompt, reusing replies to repeated prompts."""
+    if use_cloud:
+        # print(f"\n[PROMPT to Ollama Cloud LLM]: {prompt}\n")
+        return ollama_cloud_run(prompt)
+    return get_ollama_client().generate(model=model, prompt=prompt)['response']
 
-            return response['response']
+
+def chat_with_llm(prompt):
+    """Send a message to the local LLM for conversation."""
+    try:
+        # Add chat history (last 10 messages) to the prompt for context
+        history = st.session_state.get('messages', [])[-10:]
+        history_text = "\n".join([
+            f"{msg['role'].capitalize()}: {msg['content']}" for msg in history if msg['role'] in ['user', 'assistant']
+        ])
+        prompt = CHAT_PROMPT.substitute(
+            history_text=history_text,
+            prompt=prompt,
+            applicant_id=st.session_state.applicant_id,
+            decision=st.session_state.decision if st.session_state.decision else 'N/A',
+            errors=st.session_state.errors if st.session_state.errors else 'N/A'
+        )
+        model = settings.ollama_cloud_model if settings.use_ollama_cloud else settings.ollama_model
+        return _cached_generate(model, prompt, settings.use_ollama_cloud)
     except Exception as e:
         return f"I'm having trouble connecting to the AI model. Please ensure Ollama is running with the llama3.2 model. Error: {str(e)}"
 
 
+def _normalize_errors(errors) -> list:
+    """Reduce the error shapes the workflow can report (list, str, {'errors': ...}) to a list of strings."""
+    if isinstance(errors, dict):
+        errors = errors.get('errors')
+    if isinstance(errors, str):
+        return [errors]
+    return list(errors or [])
+
+
+def _serialize_decision(decision) -> str:
+    """Compact JSON for the results download; built once per decision, not on every rerun."""
+    return json.dumps(decision, separators=(',', ':'), default=str)
+
+
 def process_application_background(applicant_data, documents):
     """Process application in background."""
     try:
@@ -115,7 +147,9 @@ def process_application_background(applicant_data, documents):
         )
         
         st.session_state.decision = final_decision
-        st.session_state.errors = errors
+        st.session_state.decision_json = _serialize_decision(final_decision)
+        st.session_state.errors = _normalize_errors(errors)
+        st.session_state.error_detail = None
         st.session_state.processing = False
         
     except Exception as e:
@@ -124,10 +158,9 @@ def process_application_background(applicant_data, documents):
             'decision': 'ERROR',
             'error': str(e)
         }
-        st.session_state.errors = {
-            'errors': 'Not processed due to error',
-            'error': str(e)
-        }
+        st.session_state.decision_json = _serialize_decision(st.session_state.decision)
+        st.session_state.errors = ['Not processed due to error']
+        st.session_state.error_detail = str(e)
 
 
 # Header
@@ -176,12 +209,16 @@ with st.sidebar:
             'emirates_id': emirates_id_doc
         }
         
+        # One timestamp per submission; doc_type keeps the names in a batch distinct
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
         for doc_type, uploaded_file in file_mappings.items():
             if uploaded_file:
                 # Save file
-                file_path = upload_dir / f"{doc_type}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{uploaded_file.name.split('.')[-1]}"
+                file_path = upload_dir / f"{doc_type}_{timestamp}.{uploaded_file.name.rsplit('.', 1)[-1]}"
+                # Stream to disk in 1 MiB chunks instead of copying the whole buffer
+                uploaded_file.seek(0)
                 with open(file_path, 'wb') as f:
-                    f.write(uploaded_file.getbuffer())
+                    shutil.copyfileobj(uploaded_file, f, 1024 * 1024)
                 
                 documents.append({
                     'type': doc_type,
@@ -204,9 +241,13 @@ with st.sidebar:
                 }
             }
             
-            # Start processing in a thread
-            with st.spinner("Processing your application... This may take a minute."):
+            with st.status("Processing your application... This may take a minute.", expanded=True) as status:
+                st.write("Running document extraction, validation, eligibility and recommendation agents...")
                 process_application_background(applicant_data, documents)
+                if st.session_state.errors:
+                    status.update(label="Processing finished with errors", state="error", expanded=False)
+                else:
+                    status.update(label="Processing complete", state="complete", expanded=False)
             
             st.success("✅ Application submitted! Check the results below.")
             st.rerun()
@@ -233,7 +274,7 @@ if prompt := st.chat_input("Ask me anything about the application process..."):
         st.markdown(prompt)
     
     # Check if user wants to process application
-    if any(keyword in prompt.lower() for keyword in ['process', 'submit', 'apply', 'check eligibility']):
+    if INTENT_RE.search(prompt):
         response = "I can help you process your application! Please:\n1. Fill in your basic information in the sidebar\n2. Upload the required documents\n3. Click the '🚀 Process Application' button\n\nI'll analyze everything using our AI agents and provide you with a decision and recommendations."
     else:
         # Get response from LLM
@@ -299,44 +340,22 @@ if st.session_state.decision:
     # Download Results
     st.download_button(
         label="📥 Download Results (JSON)",
-        data=json.dumps(decision, indent=2),
+        data=st.session_state.decision_json or _serialize_decision(decision),
         file_name=f"application_results_{applicant_id}.json",
         mime="application/json"
     )
 
-# Display errors if available and non-empty
+# Display errors if available and non-empty (normalized to a list when set)
 if st.session_state.errors:
-    errors = st.session_state.errors
-    # If errors is a dict with 'errors' key as a list or string
-    error_list = []
-    if isinstance(errors, dict):
-        if isinstance(errors.get('errors'), list):
-            error_list = errors['errors']
-        elif isinstance(errors.get('errors'), str):
-            error_list = [errors['errors']]
-        else:
-            # If errors dict itself is a list
-            if isinstance(errors, list):
-                error_list = errors
-    elif isinstance(errors, list):
-        error_list = errors
-    # Only display if non-empty
-    if error_list:
-        st.divider()
-        st.header("❌ Application Errors")
-        for error in error_list:
-            st.error(error)
-    # Also show any top-level error string
-    if isinstance(errors, dict) and errors.get('error'):
-        st.divider()
-        st.header("❌ Application Error Detail")
-        st.error(errors['error'])
-
-# Processing indicator
-if st.session_state.processing:
-    with st.spinner("🔄 Processing application through AI agents..."):
-        time.sleep(1)  # Small delay to show spinner
-        st.rerun()
+    st.divider()
+    st.header("❌ Application Errors")
+    for error in st.session_state.errors:
+        st.error(error)
+# Also show any top-level error string
+if st.session_state.error_detail:
+    st.divider()
+    st.header("❌ Application Error Detail")
+    st.error(st.session_state.error_detail)
 
 # Footer
 st.divider()
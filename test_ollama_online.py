@@ -1,9 +1,4 @@
 import os
-from ollama import Client
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 prompt = """
 You are an expert resume parser. Given the following resume text, extract the following fields as JSON:        
@@ -36,21 +31,33 @@ Leadership • Project Management • Strategic Planning • Team Building • A
 Respond ONLY with a JSON object.
 """
 
-client = Client(
-    host="https://ollama.com",
-    headers={'Authorization': 'Bearer ' + os.environ.get('OLLAMA_CLOUD_API_KEY')}
-)
 
+def main():
+    # Imported here so collecting or importing this file stays cheap
+    from ollama import Client
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
+
+    client = Client(
+        host="https://ollama.com",
+        headers={'Authorization': 'Bearer ' + os.environ.get('OLLAMA_CLOUD_API_KEY')},
+        timeout=120.0
+    )
+
+    messages = [
+      {
+        'role': 'user',
+        'content': prompt,
+      },
+    ]
 
-messages = [
-  {
-    'role': 'user',
-    'content': prompt,
-  },
-]
+    # Stream tokens as they arrive instead of waiting for the full reply
+    for part in client.chat('gpt-oss:120b', messages=messages, stream=True):
+        print(part['message']['content'], end='', flush=True)
+    print()
 
-# for part in client.chat('gpt-oss:120b', messages=messages, stream=True):
-#   print(part['message']['content'], end='', flush=True)
 
-response = client.chat('gpt-oss:120b', messages=messages)
-print(response['message']['content'])
\ No newline at end of file
+if __name__ == "__main__":
+    main()